@@ -1,10 +1,10 @@
 import os
 import json
-import pandas as pd
 from datetime import datetime, timedelta
-from fredapi import Fred
 from dotenv import load_dotenv
 
+from scrapers.common.fred_api import FredClient
+
 # Load environment variables
 load_dotenv()
 
@@ -29,11 +29,7 @@ def fetch_fred_data(api_key: str, series_ids: list):
         return None
 
     print("🚀 Connecting to FRED API...")
-    try:
-        fred = Fred(api_key=api_key)
-    except Exception as e:
-        print(f"❌ Error initializing Fred client: {e}")
-        return None
+    fred = FredClient(api_key)
 
     # Calculate start date (365 days ago)
     end_date = datetime.now()
@@ -45,23 +41,8 @@ def fetch_fred_data(api_key: str, series_ids: list):
     for series_id in series_ids:
         print(f"📥 Fetching series: {series_id}...")
         try:
-            # Fetch data
-            # observation_start expects string or datetime
-            series_data = fred.get_series(series_id, observation_start=start_date)
-            
-            # Convert to list of dicts
-            processed_data = []
-            for date, value in series_data.items():
-                # Handle NaN/None values
-                if pd.isna(value):
-                    clean_value = None
-                else:
-                    clean_value = float(value)
-                
-                processed_data.append({
-                    "date": date.strftime('%Y-%m-%d'),
-                    "value": clean_value
-                })
+            # Fetch data, already decoded into [{"date", "value"}] (missing values are None)
+            processed_data = fred.observations(series_id, observation_start=start_date.strftime('%Y-%m-%d'))
             
             all_data[series_id] = processed_data
             print(f"   ✅ Retrieved {len(processed_data)} data points.")
@@ -70,6 +51,7 @@ def fetch_fred_data(api_key: str, series_ids: list):
             print(f"   ❌ Failed to fetch {series_id}: {e}")
             all_data[series_id] = []
 
+    fred.close()
     return all_data
 
 def save_to_json(data: dict):
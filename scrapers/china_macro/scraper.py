@@ -6,18 +6,40 @@ Hybrid Scraper for China Macro Economic Indicators
 2. NBS Website: Historical PMI & Latest Data via Playwright
 """
 
+import argparse
 import asyncio
 import json
+import os
 import re
-import requests
+import sys
 from datetime import datetime
 from typing import Dict, List, Any
 from playwright.async_api import async_playwright
 
+# Allow importing shared modules from scrapers/common when run directly
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.worldbank import fetch_worldbank_async, load_wdi_bulk
+
 # Configuration
 OUTPUT_FILE = "data/china_macro_data.json"
 START_YEAR_WB = 1990
 END_YEAR_WB = 2024
+# World Bank countries (ISO3). All countries go into the same requests,
+# e.g. --countries CHN VNM IDN MYS PHL THA adds ASEAN peers at no extra round trips.
+WB_COUNTRIES = ["CHN"]
+WB_INDICATORS = {
+    'NY.GDP.MKTP.KD.ZG': {
+        'name': 'gdp_growth',
+        'note': 'Annual GDP Growth (%)'
+    },
+    'NE.GDI.TOTL.KD.ZG': {
+        'name': 'investment_growth',
+        'note': 'Gross Capital Formation Growth (annual %) - Credit Proxy'
+    }
+}
 # NBS Archive depth: How many index pages to check for PMI history
 # NBS pages are roughly 15 items per page. 
 # Checking 20 pages covers roughly 300 articles ~ 2-3 years.
@@ -25,48 +47,60 @@ NBS_INDEX_PAGES = 30
 
 # --- World Bank API Functions ---
 
-def fetch_worldbank_data() -> List[Dict[str, Any]]:
-    """Fetch historical GDP and Investment data from World Bank API."""
-    print(f"\n🌍 Fetching World Bank historical data ({START_YEAR_WB}-{END_YEAR_WB})...")
+async def fetch_worldbank_data(countries: List[str] = WB_COUNTRIES) -> List[Dict[str, Any]]:
+    """Fetch historical GDP and Investment data from the World Bank API.
+
+    All indicators and countries are requested together; extra pages are fetched concurrently.
+    """
+    print(f"\n🌍 Fetching World Bank historical data ({START_YEAR_WB}-{END_YEAR_WB}) for {', '.join(countries)}...")
     
-    indicators = {
-        'NY.GDP.MKTP.KD.ZG': {
-            'name': 'gdp_growth',
-            'note': 'Annual GDP Growth (%)'
-        },
-        'NE.GDI.TOTL.KD.ZG': {
-            'name': 'investment_growth',
-            'note': 'Gross Capital Formation Growth (annual %) - Credit Proxy'
-        }
-    }
+    items = await fetch_worldbank_async(WB_INDICATORS, countries, START_YEAR_WB, END_YEAR_WB)
     
     records = []
-    
-    for indicator_code, info in indicators.items():
-        url = f"https://api.worldbank.org/v2/country/CN/indicator/{indicator_code}?format=json&date={START_YEAR_WB}:{END_YEAR_WB}&per_page=100"
-        print(f"   Getting {info['name']}...")
-        
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if len(data) >= 2:
-                    for item in data[1]:
-                        if item['value'] is not None:
-                            records.append({
-                                'indicator': info['name'],
-                                'date': f"{item['date']}-12-31",
-                                'value': round(float(item['value']), 2),
-                                'unit': 'percent',
-                                'source': 'World Bank',
-                                'note': info['note']
-                            })
-        except Exception as e:
-            print(f"   ❌ Error fetching {indicator_code}: {e}")
+    for item in items:
+        info = WB_INDICATORS.get(item['indicator']['id'])
+        if info is None or item['value'] is None:
+            continue
+        records.append({
+            'indicator': info['name'],
+            'country': item['countryiso3code'],
+            'date': f"{item['date']}-12-31",
+            'value': round(float(item['value']), 2),
+            'unit': 'percent',
+            'source': 'World Bank',
+            'note': info['note']
+        })
             
     print(f"   ✓ Extracted {len(records)} historical records from World Bank")
     return records
 
+
+def fetch_worldbank_bulk(countries: List[str] = WB_COUNTRIES, refresh: bool = False) -> List[Dict[str, Any]]:
+    """Same records as fetch_worldbank_data, read from the WDI bulk archive cache.
+
+    The archive is downloaded once per refresh and filtered into a local Parquet cache,
+    so later runs (for any tracked country/indicator) need no network.
+    """
+    print(f"\n🌍 Loading World Bank bulk data ({START_YEAR_WB}-{END_YEAR_WB}) for {', '.join(countries)}...")
+    
+    frame = load_wdi_bulk(countries, WB_INDICATORS, START_YEAR_WB, END_YEAR_WB, refresh=refresh)
+    
+    records = []
+    for row in frame.itertuples(index=False):
+        info = WB_INDICATORS[row.indicator]
+        records.append({
+            'indicator': info['name'],
+            'country': row.country,
+            'date': f"{row.year}-12-31",
+            'value': round(float(row.value), 2),
+            'unit': 'percent',
+            'source': 'World Bank',
+            'note': info['note']
+        })
+    
+    print(f"   ✓ Extracted {len(records)} historical records from World Bank (bulk)")
+    return records
+
 # --- NBS Playwright Functions ---
 
 async def scrape_nbs_history():
@@ -230,19 +264,20 @@ async def scrape_nbs_history():
 
 # --- Main Execution ---
 
-async def main():
+async def main(countries: List[str] = WB_COUNTRIES, bulk: bool = False, refresh_bulk: bool = False):
     print("=" * 60)
     print("CHINA MACRO HYBRID SCRAPER (HISTORICAL PMI)")
     print("=" * 60)
     
     all_data = []
     
-    # 1. Fetch WB Data
-    wb_data = fetch_worldbank_data()
+    # 1. Fetch WB Data and 2. Scrape NBS Data, concurrently
+    if bulk:
+        wb_fetch = asyncio.to_thread(fetch_worldbank_bulk, countries, refresh_bulk)
+    else:
+        wb_fetch = fetch_worldbank_data(countries)
+    wb_data, nbs_data = await asyncio.gather(wb_fetch, scrape_nbs_history())
     all_data.extend(wb_data)
-    
-    # 2. Scrape NBS Data
-    nbs_data = await scrape_nbs_history()
     all_data.extend(nbs_data)
     
     # Sort data
@@ -266,4 +301,13 @@ async def main():
     print("\n✅ DONE")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--countries', nargs='+', default=WB_COUNTRIES,
+                        help="World Bank countries (ISO3), e.g. CHN VNM IDN MYS PHL THA")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Read World Bank data from the WDI bulk archive cache instead of the API")
+    parser.add_argument('--refresh-bulk', action='store_true',
+                        help="With --bulk: re-download the WDI archive if it changed")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.countries, bulk=args.bulk, refresh_bulk=args.refresh_bulk))
@@ -1,62 +1,114 @@
 import os
+import sys
 import json
+import time
 import pandas as pd
 from datetime import datetime
 
+# Allow importing shared modules from scrapers/common when running this script directly
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import FredCsvCache, fetch_fred_csv_batch, read_wide_csv, write_wide_csv, year_start
+from scrapers.common.fred_records import frame_to_records
+from scrapers.common.fred_registry import series_for
+
 # Configuration
 DATA_DIR = os.path.dirname(__file__) + "/data"
 JSON_OUTPUT = os.path.join(DATA_DIR, "commodity_cycles.json")
+START_YEAR = 2020
 
-# Indicators
-INDICATORS = {
-    "PALLFNFINDEXM": {
-        "name": "Global Price Index of All Commodities",
-        "category": "Commodity Index",
-        "unit": "Index 2016=100",
-        "description": "IMF Global Price Index of All Commodities, Monthly. Base Year 2016 = 100."
-    }
-}
+# Local cache of the batched FRED download (same layout as fredgraph.csv: observation_date, ID1, ID2, ...)
+CACHE_FILE = os.path.join(DATA_DIR, "commodity_cycles_cache.csv")
+# IMF commodity indices are monthly; a day-old cache is fresh enough for most runs
+CACHE_TTL_HOURS = 24
+# Manually downloaded PALLFNFINDEXM CSV, used only as a last resort
+LEGACY_CSV = os.path.join(DATA_DIR, "temp.csv")
+
+# Indicators (declared in scrapers/common/fred_registry.py)
+INDICATORS = series_for("commodity_cycles")
+
+
+def cache_age_hours(path):
+    """
+    Tuổi của file cache (giờ), hoặc None nếu chưa có cache.
+    """
+    if not os.path.exists(path):
+        return None
+    return (time.time() - os.path.getmtime(path)) / 3600
 
 
-def main():
-    print("--- Commodity Cycles Scraper (Local CSV) ---")
+def load_frames(ttl_hours=CACHE_TTL_HOURS, refresh=False, frames=None):
+    """
+    Lấy dữ liệu các chỉ số: dùng cache nếu còn mới, nếu không thì tải batch từ FRED và cập nhật cache.
+    Khi tải lỗi, dùng lại cache cũ (kể cả đã quá TTL), cuối cùng là file temp.csv tải tay.
+    Trả về dict {series_id: DataFrame(date, value)}.
+    """
+    series_ids = list(INDICATORS)
     
-    all_data = []
-    series_id = "PALLFNFINDEXM"
-    info = INDICATORS[series_id]
+    if frames is None:
+        age = cache_age_hours(CACHE_FILE)
+        if age is not None and age < ttl_hours and not refresh:
+            cached = read_wide_csv(CACHE_FILE, series_ids)
+            # Cache thiếu series (ví dụ series mới thêm vào registry) thì không coi là còn mới
+            if all(series_id in cached for series_id in series_ids):
+                print(f"♻️  Using cache ({age:.1f}h old, TTL {ttl_hours}h): {CACHE_FILE}")
+                return cached
+        
+        print(f"📥 Fetching {len(series_ids)} IMF commodity indices from FRED (batch)...")
+        frames = fetch_fred_csv_batch(series_ids, start_date=year_start(START_YEAR), cache=FredCsvCache())
+    else:
+        frames = {series_id: frames[series_id] for series_id in series_ids if series_id in frames}
+    
+    if frames:
+        # Series tải lỗi lần này lấy lại từ cache cũ; chỉ ghi (làm mới TTL) khi đủ mọi series,
+        # để cache thiếu series không được dùng như cache mới
+        if os.path.exists(CACHE_FILE):
+            frames = {**read_wide_csv(CACHE_FILE, series_ids), **frames}
+        if all(series_id in frames for series_id in series_ids):
+            write_wide_csv(CACHE_FILE, frames)
+            print(f"   ✅ Cached {len(frames)} series to {CACHE_FILE}")
+        else:
+            missing = [series_id for series_id in series_ids if series_id not in frames]
+            print(f"   ⚠️  Missing {', '.join(missing)}, cache not updated")
+        return frames
+    
+    if os.path.exists(CACHE_FILE):
+        print(f"   ⚠️  Download failed, falling back to stale cache: {CACHE_FILE}")
+        return read_wide_csv(CACHE_FILE, series_ids)
     
-    csv_file = os.path.join(DATA_DIR, "temp.csv")
-    print(f"Reading from: {csv_file}")
+    if os.path.exists(LEGACY_CSV):
+        print(f"   ⚠️  Download failed, falling back to {LEGACY_CSV}")
+        df = pd.read_csv(LEGACY_CSV)
+        df.columns = ['date', 'value']
+        return {"PALLFNFINDEXM": df}
+    
+    return {}
+
+
+def main(ttl_hours=CACHE_TTL_HOURS, refresh=False, frames=None):
+    print("--- Commodity Cycles Scraper (FRED / IMF, cached) ---")
+    
+    all_data = []
     
     try:
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file)
-            
-            # Column names: observation_date, {series_id}
-            # Often FRED CSV has 'observation_date', 'PALLFNFINDEXM'
-            # Let's handle dynamic column names or just assume position
-            df.columns = ['date', 'value']
+        frames = load_frames(ttl_hours, refresh, frames)
+        
+        for series_id, info in INDICATORS.items():
+            if series_id not in frames:
+                print(f"   ⚠️  No data for {series_id}")
+                continue
             
             # Filter data from 2020
-            df['date'] = pd.to_datetime(df['date'])
-            df = df[df['date'].dt.year >= 2020]
-            
-            for _, row in df.iterrows():
-                if pd.notna(row['value']) and row['value'] != '.':
-                    all_data.append({
-                        "date": row['date'].strftime('%Y-%m-%d'),
-                        "year": row['date'].year,
-                        "month": row['date'].month,
-                        "value": float(row['value']),
-                        "indicator": info["name"],
-                        "category": info["category"],
-                        "unit": info["unit"],
-                        "series_id": series_id
-                    })
-            
-            print(f"   ✅ Processed {len(all_data)} records")
-        else:
-             print(f"   ❌ File not found: {csv_file}")
+            records = frame_to_records(frames[series_id], {
+                "indicator": info["name"],
+                "category": info["category"],
+                "unit": info["unit"],
+                "series_id": series_id
+            }, start_year=START_YEAR)
+            all_data.extend(records)
+            print(f"   ✅ {info['name']}: {len(records)} records")
              
     except Exception as e:
         print(f"   ❌ Error: {e}")
@@ -71,6 +123,7 @@ def main():
     }
     
     # Save to JSON
+    os.makedirs(DATA_DIR, exist_ok=True)
     try:
         with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
             json.dump(output_structure, f, indent=2, ensure_ascii=False)
@@ -82,4 +135,11 @@ def main():
     print("Done.")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ttl-hours', type=float, default=CACHE_TTL_HOURS,
+                        help="Use the local cache if it is younger than this many hours")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cache and download again")
+    args = parser.parse_args()
+    
+    main(ttl_hours=args.ttl_hours, refresh=args.refresh)
@@ -1,10 +1,20 @@
 import os
+import sys
 import json
-import requests
-import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import (
+    FredCsvCache, fetch_fred_csv_concurrent, year_start
+)
+from scrapers.common.fred_records import frame_to_records
+from scrapers.common.fred_registry import series_for
+
 # Load environment variables
 load_dotenv()
 
@@ -13,130 +23,58 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 JSON_OUTPUT = os.path.join(DATA_DIR, "commodity_prices.json")
 
 # FRED Series IDs for Commodity Prices (Monthly data)
-# Nguồn: Federal Reserve Economic Data (FRED)
-COMMODITIES = {
-    # Năng lượng / Energy
-    "DCOILWTICO": {
-        "name": "Crude Oil - WTI",
-        "category": "Energy",
-        "unit": "USD per Barrel"
-    },
-    "DCOILBRENTEU": {
-        "name": "Crude Oil - Brent",
-        "category": "Energy", 
-        "unit": "USD per Barrel"
-    },
-    "PNGASEUUSDM": {
-        "name": "Natural Gas - Europe",
-        "category": "Energy",
-        "unit": "USD per Million BTU"
-    },
-    
-    # Kim loại / Metals
-    "PCOPPUSDM": {
-        "name": "Copper",
-        "category": "Metals",
-        "unit": "USD per Metric Ton"
-    },
-    "WPU101": {
-        "name": "Steel - Iron and Steel (PPI)",
-        "category": "Metals",
-        "unit": "Index (PPI)"
-    },
-    
-    # Nông sản / Agriculture
-    "PWHEAMTUSDM": {
-        "name": "Wheat",
-        "category": "Agriculture",
-        "unit": "USD per Metric Ton"
-    },
-    "PMAIZMTUSDM": {
-        "name": "Maize (Corn)",
-        "category": "Agriculture",
-        "unit": "USD per Metric Ton"
-    },
-    "PSOYBUSDQ": {
-        "name": "Soybeans",
-        "category": "Agriculture",
-        "unit": "USD per Metric Ton"
-    },
-    "PCOFFOTMUSDM": {
-        "name": "Coffee",
-        "category": "Agriculture",
-        "unit": "USD per Kilogram"
-    },
-    "PSUGAISAUSDM": {
-        "name": "Sugar",
-        "category": "Agriculture", 
-        "unit": "USD per Kilogram"
-    },
-    "PRICENPUSDM": {
-        "name": "Rice",
-        "category": "Agriculture",
-        "unit": "USD per Metric Ton"
-    },
-    
-    # Phân bón / Fertilizer  
-    "PCU325311325311P": {
-        "name": "Fertilizer - Nitrogenous (Primary Products)",
-        "category": "Fertilizer",
-        "unit": "Index (PPI)"
-    }
-}
+# Nguồn: Federal Reserve Economic Data (FRED), khai báo trong scrapers/common/fred_registry.py
+COMMODITIES = series_for("commodity_prices")
+
+
+def build_commodity_records(df, series_id, commodity_info, start_year=2020):
+    """
+    Chuyển DataFrame (date, value) của một series thành list các bản ghi output.
+    """
+    return frame_to_records(df, {
+        "commodity": commodity_info["name"],
+        "category": commodity_info["category"],
+        "unit": commodity_info["unit"],
+        "series_id": series_id
+    }, start_year=start_year)
 
 
 def fetch_commodity_data(series_id, commodity_info, start_year=2020):
     """
-    Lấy dữ liệu commodity từ FRED API.
+    Lấy dữ liệu một commodity từ FRED, qua cùng đường tải với fetch_commodity_data_batch (cache, tải song song).
     """
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Parse CSV data  
-        from io import StringIO
-        df = pd.read_csv(StringIO(response.text))
-        
-        # Column names: observation_date, {series_id}
-        df.columns = ['date', 'value']
-        
-        # Filter data từ start_year
-        df['date'] = pd.to_datetime(df['date'])
-        df = df[df['date'].dt.year >= start_year]
-        
-        # Convert to list of dicts
-        records = []
-        for _, row in df.iterrows():
-            if pd.notna(row['value']) and row['value'] != '.':  # Chỉ lấy data không null
-                records.append({
-                    "date": row['date'].strftime('%Y-%m-%d'),
-                    "year": row['date'].year,
-                    "month": row['date'].month,
-                    "value": float(row['value']),
-                    "commodity": commodity_info["name"],
-                    "category": commodity_info["category"],
-                    "unit": commodity_info["unit"],
-                    "series_id": series_id
-                })
-        
-        return records
+    return fetch_commodity_data_batch({series_id: commodity_info}, start_year).get(series_id, [])
+
+
+def fetch_commodity_data_batch(commodities, start_year=2020, frames=None):
+    """
+    Lấy dữ liệu nhiều commodity trong một (hoặc vài) request fredgraph.csv.
+    frames ({series_id: DataFrame}) là dữ liệu đã tải sẵn bởi fred_engine, khi đó không gọi FRED nữa.
+    Trả về dict {series_id: records}.
+    """
+    if frames is None:
+        frames = fetch_fred_csv_concurrent(commodities.keys(), start_date=year_start(start_year),
+                                           cache=FredCsvCache())
     
-    except Exception as e:
-        print(f"   ❌ Lỗi khi tải {series_id}: {e}")
-        return []
+    return {
+        series_id: build_commodity_records(frames[series_id], series_id, commodity_info, start_year)
+        for series_id, commodity_info in commodities.items()
+        if series_id in frames
+    }
 
 
-def main():
+def main(frames=None):
     print("--- Commodity Prices Scraper (FRED) ---\n")
     
     all_data = []
     
+    print(f"📥 Đang tải {len(COMMODITIES)} commodities từ FRED (batch)...\n")
+    batch_data = fetch_commodity_data_batch(COMMODITIES, frames=frames)
+    
     for series_id, commodity_info in COMMODITIES.items():
-        print(f"📥 Đang tải {commodity_info['name']} ({commodity_info['category']})...")
+        print(f"📥 {commodity_info['name']} ({commodity_info['category']})...")
         
-        data = fetch_commodity_data(series_id, commodity_info)
+        data = batch_data.get(series_id, [])
         
         if data:
             all_data.extend(data)
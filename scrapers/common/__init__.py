@@ -0,0 +1,3 @@
+"""
+Các module dùng chung cho những scraper trong thư mục scrapers/.
+"""
@@ -0,0 +1,102 @@
+"""
+Benchmark: vòng lặp iterrows cũ so với frame_to_records trên dữ liệu full-history.
+
+Dữ liệu giả lập giống series ngày của FRED (ví dụ DFF từ 1954): mỗi ngày một quan sát,
+khoảng 2% giá trị là '.' (ngày nghỉ). Kết quả hai cách được so sánh để đảm bảo giống hệt nhau.
+
+Chạy: python scrapers/common/bench_fred_records.py [--rows 26000] [--series 3] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_records import frame_to_records
+
+METADATA = {
+    "indicator": "Effective Federal Funds Rate",
+    "category": "Interest Rate",
+    "unit": "Percent",
+    "description": "The interest rate at which depository institutions lend reserve balances to other depository institutions overnight",
+    "series_id": "DFF"
+}
+
+
+def make_series(rows, seed):
+    """
+    Tạo DataFrame (date, value) dạng chuỗi như khi đọc từ fredgraph.csv.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1954-07-01", periods=rows, freq="D").strftime("%Y-%m-%d")
+    values = np.round(rng.uniform(0, 20, rows), 2).astype(str).astype(object)
+    values[rng.random(rows) < 0.02] = "."
+    return pd.DataFrame({"date": dates, "value": values})
+
+
+def legacy_records(df, metadata, start_year):
+    """
+    Cách làm cũ trong các scraper (df.iterrows), giữ lại để so sánh.
+    """
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df = df[df['date'].dt.year >= start_year]
+
+    records = []
+    for _, row in df.iterrows():
+        if pd.notna(row['value']) and row['value'] != '.':
+            record = {
+                "date": row['date'].strftime('%Y-%m-%d'),
+                "year": row['date'].year,
+                "month": row['date'].month,
+                "day": row['date'].day,
+                "value": float(row['value']),
+            }
+            record.update(metadata)
+            records.append(record)
+    return records
+
+
+def best_time(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=26000, help="Số quan sát mỗi series")
+    parser.add_argument('--series', type=int, default=3, help="Số series")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--start-year', type=int, default=1954)
+    args = parser.parse_args()
+
+    frames = [make_series(args.rows, seed) for seed in range(args.series)]
+    date_parts = ("year", "month", "day")
+
+    legacy_time, legacy = best_time(
+        lambda: [legacy_records(df, METADATA, args.start_year) for df in frames], args.repeat)
+    vector_time, vector = best_time(
+        lambda: [frame_to_records(df, METADATA, args.start_year, date_parts) for df in frames], args.repeat)
+
+    assert legacy == vector, "Kết quả frame_to_records khác với cách làm cũ"
+
+    total = sum(len(r) for r in vector)
+    print(f"--- Benchmark: {args.series} series x {args.rows} rows ({total} records) ---")
+    print(f"   iterrows:         {legacy_time:.3f}s")
+    print(f"   frame_to_records: {vector_time:.3f}s")
+    print(f"   Speedup:          {legacy_time / vector_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
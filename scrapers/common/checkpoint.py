@@ -0,0 +1,72 @@
+"""
+Journal checkpoint (JSONL, chỉ ghi thêm) cho các lượt crawl dài.
+
+Mỗi dòng là một entry JSON độc lập. Entry được gom trong bộ nhớ và ghi xuống đĩa theo lô
+(batch_size entry một lần, kèm fsync), nên một lần crash chỉ mất tối đa một lô chưa ghi.
+Khi đọc lại, dòng cuối bị ghi dở (do crash giữa chừng) được bỏ qua.
+"""
+import json
+import os
+from typing import List
+
+DEFAULT_BATCH_SIZE = 20
+
+
+class CheckpointJournal:
+    """
+    Journal JSONL append-only: start() tạo journal mới, append() thêm entry, read() đọc lại khi resume.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer: List[str] = []
+
+    def start(self):
+        """
+        Bắt đầu journal mới (xóa journal của lượt chạy trước).
+        """
+        self.buffer = []
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        open(self.path, 'w', encoding='utf-8').close()
+
+    def append(self, entry: dict):
+        self.buffer.append(json.dumps(entry, ensure_ascii=False))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(self.buffer) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.buffer = []
+
+    def read(self) -> List[dict]:
+        """
+        Các entry đã ghi xuống đĩa. Trả về [] nếu chưa có journal.
+        """
+        entries = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # Dòng ghi dở khi crash
+                        break
+        except OSError:
+            pass
+        return entries
+
+    def remove(self):
+        """
+        Xóa journal sau khi lượt chạy đã hoàn tất và output đã được lưu.
+        """
+        self.buffer = []
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+"""
+Client gọn cho FRED API (api.stlouisfed.org), thay cho fredapi.
+
+- Giữ kết nối (keep-alive) qua một session dùng chung thay vì mở kết nối mới cho mỗi lời gọi.
+- Gọi với file_type=json và chuyển thẳng sang dict/list mà các scraper lưu,
+  không qua XML hay pandas. Observations có dạng [{"date": "YYYY-MM-DD", "value": float | None}].
+- FredClient (đồng bộ, requests) cho các script ít lời gọi; AsyncFredClient (aiohttp) cho crawl lớn,
+  có token bucket theo giới hạn của FRED và tự thử lại khi gặp 429/5xx.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrapers.common.rate_limit import RETRY_STATUSES, AsyncTokenBucket, retry_with_backoff
+
+FRED_API_URL = "https://api.stlouisfed.org/fred"
+
+# Giới hạn của FRED API: 120 request/phút cho mỗi API key
+REQUESTS_PER_SECOND = 2
+DEFAULT_MAX_CONNECTIONS = 8
+
+# Số kết quả tối đa FRED trả về trong một trang của category/series
+PAGE_LIMIT = 1000
+
+
+def _observation_records(payload: dict) -> List[Dict[str, object]]:
+    # FRED dùng "." cho giá trị thiếu
+    return [
+        {"date": obs["date"], "value": float(obs["value"]) if obs["value"] != "." else None}
+        for obs in payload.get("observations", [])
+    ]
+
+
+def _series_info(payload: dict, series_id: str) -> dict:
+    series = payload.get("seriess", [])
+    if not series:
+        raise ValueError(f"No info exists for series id: {series_id}")
+    return series[0]
+
+
+class FredClient:
+    """
+    Client đồng bộ: một requests.Session (connection pool) cho mọi lời gọi,
+    tự thử lại các lỗi 429/5xx với backoff (tôn trọng Retry-After).
+    """
+
+    def __init__(self, api_key: str, timeout: int = 30, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=5, backoff_factor=1, status_forcelist=sorted(RETRY_STATUSES),
+                      allowed_methods=["GET"], respect_retry_after_header=True)
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=max_connections, max_retries=retry))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def get(self, path: str, **params) -> dict:
+        response = self.session.get(f"{FRED_API_URL}/{path}", params={
+            **params, "api_key": self.api_key, "file_type": "json"
+        }, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def series_info(self, series_id: str) -> dict:
+        return _series_info(self.get("series", series_id=series_id), series_id)
+
+    def observations(self, series_id: str, observation_start: Optional[str] = None,
+                     observation_end: Optional[str] = None, **params) -> List[Dict[str, object]]:
+        """
+        params: tham số khác của series/observations, ví dụ frequency="m", aggregation_method="avg",
+        units="pc1" để FRED tự gộp tần suất / tính biến đổi trước khi trả về.
+        """
+        if observation_start:
+            params["observation_start"] = observation_start
+        if observation_end:
+            params["observation_end"] = observation_end
+        return _observation_records(self.get("series/observations", series_id=series_id, **params))
+
+
+class AsyncFredClient:
+    """
+    Client asyncio: một aiohttp.ClientSession với tối đa max_connections kết nối,
+    mọi request lấy token từ một token bucket (requests_per_second) và được thử lại khi gặp lỗi tạm thời.
+
+    Dùng: async with AsyncFredClient(api_key) as fred: ...
+    """
+
+    def __init__(self, api_key: str, timeout: int = 30, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 requests_per_second: float = REQUESTS_PER_SECOND):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.limiter = AsyncTokenBucket(requests_per_second)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """
+        Lỗi tạm thời nên thử lại: 429/5xx, mất kết nối, timeout.
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RETRY_STATUSES
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+    async def get(self, path: str, **params) -> dict:
+        url = f"{FRED_API_URL}/{path}"
+        params = {**params, "api_key": self.api_key, "file_type": "json"}
+
+        async def attempt():
+            await self.limiter.acquire()
+            async with self.session.get(url, params=params) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        return await retry_with_backoff(attempt, self.is_retryable)
+
+    async def series_info(self, series_id: str) -> dict:
+        return _series_info(await self.get("series", series_id=series_id), series_id)
+
+    async def observations(self, series_id: str, observation_start: Optional[str] = None,
+                           observation_end: Optional[str] = None, **params) -> List[Dict[str, object]]:
+        if observation_start:
+            params["observation_start"] = observation_start
+        if observation_end:
+            params["observation_end"] = observation_end
+        return _observation_records(await self.get("series/observations", series_id=series_id, **params))
+
+    async def latest_observation(self, series_id: str) -> Tuple[Optional[str], Optional[float]]:
+        """
+        Quan sát mới nhất của series (sort_order=desc & limit=1). Trả về (date, value).
+        """
+        records = await self.observations(series_id, sort_order="desc", limit=1)
+        if not records:
+            return None, None
+        return records[0]["date"], records[0]["value"]
+
+    async def category_children(self, category_id: int) -> List[int]:
+        payload = await self.get("category/children", category_id=category_id)
+        return [child["id"] for child in payload.get("categories", [])]
+
+    async def category_series(self, category_id: int) -> List[dict]:
+        """
+        Tất cả series nằm trực tiếp trong category (tự lấy các trang tiếp theo nếu quá PAGE_LIMIT).
+        """
+        series = []
+        while True:
+            payload = await self.get("category/series", category_id=category_id,
+                                     limit=PAGE_LIMIT, offset=len(series))
+            page = payload.get("seriess", [])
+            series.extend(page)
+            if not page or len(series) >= payload.get("count", 0):
+                return series
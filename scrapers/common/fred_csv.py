@@ -0,0 +1,494 @@
+"""
+Tiện ích dùng chung để tải dữ liệu từ fredgraph.csv của FRED.
+
+fredgraph.csv nhận nhiều series trong một request (id=A,B,C) và trả về một CSV "rộng":
+cột đầu là ngày, mỗi series một cột. Module này gom các series vào ít request nhất có thể
+rồi tách kết quả lại thành từng DataFrame (date, value) riêng cho mỗi series.
+
+Khoảng thời gian được gửi lên server qua tham số cosd/coed (observation start/end date)
+nên chỉ phần dữ liệu cần dùng mới được truyền về, thay vì tải toàn bộ lịch sử rồi mới lọc.
+coed chỉ được gửi khi có end_date: URL (và khóa so khớp của cache) giữ nguyên giữa các ngày chạy.
+
+FredCsvCache lưu ETag/Last-Modified cùng dữ liệu đã parse trên đĩa; các lần chạy sau gửi
+If-None-Match/If-Modified-Since và khi FRED trả về 304 thì bỏ qua cả việc tải lẫn parse CSV.
+
+fetch_fred_csv_async/fetch_fred_csv_concurrent chạy các nhóm request song song bằng aiohttp,
+giới hạn số request đồng thời và tốc độ request theo từng host (token bucket).
+
+Body CSV được parse thẳng từ bytes của response (không decode thành str rồi bọc StringIO),
+bằng pyarrow.csv nếu có cài, với kiểu dữ liệu khai báo trước (ngày: timestamp, giá trị: float64)
+để bỏ qua bước đoán kiểu; không có pyarrow thì dùng engine C của pandas với cùng kiểu dữ liệu.
+
+Mỗi series có thể kèm một transform để FRED tính sẵn trước khi gửi về (fq/fam/transformation của
+fredgraph), dùng cùng tên và giá trị với FRED API: {"frequency": "m", "aggregation_method": "avg",
+"units": "pc1"}. Series có transform được truyền dưới dạng (series_id, transform) và trả về theo khóa
+series_key(series_id, transform), ví dụ "DGS10@m-avg-pc1"; series không có transform giữ khóa là series_id.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import aiohttp
+import pandas as pd
+import requests
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+from scrapers.common.rate_limit import HostRateLimiter
+
+FREDGRAPH_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+
+# Độ dài URL tối đa cho một request (giữ dưới ngưỡng ~2000 ký tự mà đa số server/proxy chấp nhận)
+MAX_URL_LENGTH = 2000
+
+# Số request đồng thời tối đa và tốc độ tối đa (request/giây) tới mỗi host ở chế độ async
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_SECOND = 5
+
+# Giá trị thiếu trong fredgraph.csv: "." (file cũ) hoặc ô trống
+NA_VALUES = ['.', '']
+
+# Ngày YYYY-MM-DD dùng chung cho mọi series, hoặc dict {series_id: YYYY-MM-DD} cho từng series
+DateArg = Union[str, Dict[str, str], None]
+
+# Transform phía server: frequency (d, w, bw, m, q, sa, a), aggregation_method (avg, sum, eop),
+# units (lin, chg, ch1, pch, pc1, pca, cch, cca, log)
+Transform = Dict[str, str]
+# Series ID, hoặc (series ID, transform)
+SeriesSpec = Union[str, Tuple[str, Transform]]
+
+# Mã frequency của FRED API -> giá trị fq của fredgraph
+FREQUENCY_NAMES = {
+    "d": "Daily",
+    "w": "Weekly, Ending Friday",
+    "bw": "Biweekly, Ending Wednesday",
+    "m": "Monthly",
+    "q": "Quarterly",
+    "sa": "Semiannual",
+    "a": "Annual",
+}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "fredgraph")
+
+
+class FredCsvCache:
+    """
+    Cache trên đĩa cho response fredgraph.csv, khóa theo series ID.
+
+    Mỗi mục gồm {key}.json (URL đã gọi và các validator ETag/Last-Modified)
+    và {key}.pkl (các DataFrame đã tách theo series, để khi nhận 304 không phải parse lại).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(series_ids: List[str]) -> str:
+        key = "_".join(series_ids)
+        # Tên file quá dài khi gộp nhiều series, dùng hash thay thế
+        if len(key) > 100:
+            key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return key
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def validators(self, series_ids: List[str], url: str) -> Dict[str, str]:
+        """
+        Header điều kiện cho request. Chỉ dùng khi mục cache được tạo từ đúng URL này.
+        """
+        try:
+            with open(self._path(self.key(series_ids), "json"), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if entry.get("url") != url:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_frames(self, series_ids: List[str]) -> Optional[Dict[str, pd.DataFrame]]:
+        try:
+            with open(self._path(self.key(series_ids), "pkl"), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def store(self, series_ids: List[str], url: str, response_headers, frames: Dict[str, pd.DataFrame]):
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        # Server không trả validator thì không có gì để dùng cho lần sau
+        if not etag and not last_modified:
+            return
+
+        key = self.key(series_ids)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(key, "pkl"), 'wb') as f:
+            pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self._path(key, "json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                "series_ids": series_ids,
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified
+            }, f, indent=2)
+
+
+def year_start(start_year: Optional[int]) -> Optional[str]:
+    """
+    Ngày đầu tiên của start_year theo định dạng cosd (YYYY-MM-DD).
+    """
+    return f"{start_year}-01-01" if start_year else None
+
+
+def series_key(series_id: str, transform: Optional[Transform] = None) -> str:
+    """
+    Khóa của một series trong kết quả/cache: series_id, hoặc "ID@frequency-aggregation-units" nếu có transform.
+    """
+    if not transform:
+        return series_id
+    parts = (transform.get(name, "") for name in ("frequency", "aggregation_method", "units"))
+    return f"{series_id}@{'-'.join(parts)}"
+
+
+def _split_spec(spec: SeriesSpec) -> Tuple[str, Transform]:
+    if isinstance(spec, str):
+        return spec, {}
+    return spec[0], dict(spec[1] or {})
+
+
+def _group_by_transform(series: Iterable[SeriesSpec]) -> List[Tuple[Transform, List[str]]]:
+    """
+    Gom các series có cùng transform (mỗi request fredgraph chỉ dùng một transform), giữ thứ tự xuất hiện
+    và bỏ các khóa trùng.
+    """
+    groups = {}
+    for spec in series:
+        series_id, transform = _split_spec(spec)
+        ids = groups.setdefault(tuple(sorted(transform.items())), [])
+        if series_id not in ids:
+            ids.append(series_id)
+    return [(dict(transform), ids) for transform, ids in groups.items()]
+
+
+def _series_dates(value: Union[str, Dict[str, str], None], series_ids: List[str]) -> List[str]:
+    if isinstance(value, dict):
+        return [value[series_id] for series_id in series_ids]
+    return [value] * len(series_ids)
+
+
+def _build_params(series_ids: List[str], start_date: DateArg = None, end_date: DateArg = None,
+                  transform: Optional[Transform] = None) -> Dict[str, str]:
+    params = {"id": ",".join(series_ids)}
+
+    # fredgraph nhận cosd/coed (và fq/fam/transformation) theo từng series, cách nhau bởi dấu phẩy
+    if start_date:
+        params["cosd"] = ",".join(_series_dates(start_date, series_ids))
+    if end_date:
+        params["coed"] = ",".join(_series_dates(end_date, series_ids))
+
+    transform = transform or {}
+    if transform.get("frequency"):
+        params["fq"] = ",".join([FREQUENCY_NAMES.get(transform["frequency"], transform["frequency"])] * len(series_ids))
+    if transform.get("aggregation_method"):
+        params["fam"] = ",".join([transform["aggregation_method"]] * len(series_ids))
+    if transform.get("units"):
+        params["transformation"] = ",".join([transform["units"]] * len(series_ids))
+
+    return params
+
+
+def build_url(series_ids: List[str], start_date: DateArg = None, end_date: DateArg = None,
+              transform: Optional[Transform] = None) -> str:
+    """
+    Tạo URL fredgraph.csv cho một nhóm series (giữ nguyên dấu phẩy để URL ngắn nhất).
+    """
+    params = _build_params(series_ids, start_date, end_date, transform)
+    return f"{FREDGRAPH_URL}?{urlencode(params, safe=',')}"
+
+
+def chunk_series_ids(series_ids: Iterable[str], max_url_length: int = MAX_URL_LENGTH,
+                     start_date: DateArg = None, end_date: DateArg = None,
+                     batch_size: Optional[int] = None,
+                     transform: Optional[Transform] = None) -> List[List[str]]:
+    """
+    Chia danh sách series ID thành các nhóm sao cho URL của mỗi nhóm không vượt quá max_url_length
+    (và không quá batch_size series mỗi nhóm nếu có).
+    """
+    chunks = []
+    current = []
+
+    for series_id in series_ids:
+        too_long = len(build_url(current + [series_id], start_date, end_date, transform)) > max_url_length
+        if current and (too_long or (batch_size and len(current) >= batch_size)):
+            chunks.append(current)
+            current = []
+        current.append(series_id)
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def split_wide_frame(wide: pd.DataFrame, series_ids: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Tách CSV rộng (observation_date, ID1, ID2, ...) thành {series_id: DataFrame(date, value)}.
+    Các dòng trống do ghép ngày giữa các series (outer join) được loại bỏ.
+    Cột của series có transform được fredgraph đặt tên kèm hậu tố (ví dụ DGS10_PC1).
+    """
+    date_col = wide.columns[0]
+    columns = {str(col).upper(): col for col in wide.columns[1:]}
+
+    frames = {}
+    for series_id in series_ids:
+        col = columns.get(series_id.upper())
+        if col is None:
+            col = next((col for name, col in columns.items() if name.startswith(f"{series_id.upper()}_")), None)
+        if col is None:
+            continue
+
+        df = wide[[date_col, col]].dropna(subset=[col])
+        df.columns = ['date', 'value']
+        frames[series_id] = df.reset_index(drop=True)
+
+    return frames
+
+
+def read_fred_csv(source: Union[bytes, str]) -> pd.DataFrame:
+    """
+    Parse CSV rộng dạng fredgraph.csv từ bytes (body của response) hoặc đường dẫn file.
+
+    Kiểu dữ liệu được khai báo trước từ dòng header: cột đầu là ngày, các cột còn lại là float64.
+    """
+    if isinstance(source, bytes):
+        header = source[:source.find(b'\n')]
+    else:
+        with open(source, 'rb') as f:
+            header = f.readline()
+    names = header.decode('utf-8-sig').strip().split(',')
+
+    if CSV_ENGINE == "pyarrow":
+        # pyarrow đọc trực tiếp trên vùng nhớ của bytes (không copy) và parse đa luồng
+        column_types = {names[0]: pa.timestamp('s'), **{name: pa.float64() for name in names[1:]}}
+        table = pa_csv.read_csv(
+            pa.BufferReader(pa.py_buffer(source)) if isinstance(source, bytes) else source,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, null_values=NA_VALUES)
+        )
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+
+    return pd.read_csv(BytesIO(source) if isinstance(source, bytes) else source,
+                       dtype={name: 'float64' for name in names[1:]},
+                       na_values=NA_VALUES, parse_dates=[names[0]])
+
+
+def read_wide_csv(path: str, series_ids: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Đọc file CSV rộng (cùng định dạng fredgraph.csv) đã lưu trên đĩa và tách theo series.
+    """
+    return split_wide_frame(read_fred_csv(path), series_ids)
+
+
+def write_wide_csv(path: str, frames: Dict[str, pd.DataFrame]):
+    """
+    Ghép các DataFrame (date, value) thành một CSV rộng (observation_date, ID1, ID2, ...).
+    """
+    columns = [df.set_index('date')['value'].rename(series_id) for series_id, df in frames.items()]
+    wide = pd.concat(columns, axis=1).sort_index()
+    wide.index.name = 'observation_date'
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    wide.to_csv(path)
+
+
+def _parse_body(content: bytes, series_ids: List[str]) -> Dict[str, pd.DataFrame]:
+    return split_wide_frame(read_fred_csv(content), series_ids)
+
+
+def _print_not_modified(series_ids: List[str]):
+    print(f"   ♻️  {', '.join(series_ids)}: không có dữ liệu mới (304), dùng cache")
+
+
+def _fetch_chunk(series_ids: List[str], session, timeout: int, start_date: DateArg,
+                 end_date: DateArg, cache: Optional[FredCsvCache],
+                 transform: Optional[Transform] = None) -> Dict[str, pd.DataFrame]:
+    url = build_url(series_ids, start_date, end_date, transform)
+    keys = [series_key(series_id, transform) for series_id in series_ids]
+    headers = cache.validators(keys, url) if cache else {}
+
+    response = session.get(url, timeout=timeout, headers=headers)
+
+    if response.status_code == 304:
+        frames = cache.load_frames(keys)
+        if frames is not None:
+            _print_not_modified(keys)
+            return frames
+        # Mục cache hỏng: tải lại không kèm điều kiện
+        response = session.get(url, timeout=timeout)
+
+    response.raise_for_status()
+
+    frames = _parse_body(response.content, series_ids)
+    frames = {series_key(series_id, transform): df for series_id, df in frames.items()}
+
+    if cache:
+        cache.store(keys, url, response.headers, frames)
+
+    return frames
+
+
+def fetch_fred_csv_batch(series_ids: Iterable[SeriesSpec], start_date: DateArg = None,
+                         end_date: DateArg = None, session=None, timeout: int = 30,
+                         cache: Optional[FredCsvCache] = None,
+                         batch_size: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Tải nhiều series FRED bằng ít request nhất có thể.
+
+    start_date/end_date (YYYY-MM-DD, hoặc dict theo từng series) giới hạn khoảng dữ liệu
+    ngay tại server. Không có end_date thì không gửi coed (FRED trả đến quan sát mới nhất), nên URL của
+    nhóm không đổi theo ngày chạy và validator trong cache vẫn dùng được ở các ngày sau.
+    cache (FredCsvCache) bật conditional GET: series không đổi được lấy lại từ đĩa.
+    Phần tử của series_ids có thể là (series_id, transform) để FRED đổi tần suất/đơn vị trước khi gửi.
+
+    Trả về dict {series_key: DataFrame(date, value)}. Nếu cả nhóm bị lỗi (ví dụ có một ID sai),
+    các series trong nhóm được tải lại riêng lẻ để không mất dữ liệu của những series còn lại.
+    """
+    http = session or requests.Session()
+    frames = {}
+
+    for transform, ids in _group_by_transform(series_ids):
+        for chunk in chunk_series_ids(ids, start_date=start_date, end_date=end_date,
+                                      batch_size=batch_size, transform=transform):
+            try:
+                frames.update(_fetch_chunk(chunk, http, timeout, start_date, end_date, cache, transform))
+                continue
+            except Exception as e:
+                if len(chunk) == 1:
+                    print(f"   ❌ Lỗi khi tải {chunk[0]}: {e}")
+                    continue
+                print(f"   ⚠️  Lỗi khi tải nhóm {len(chunk)} series ({e}), thử tải riêng từng series...")
+
+            for series_id in chunk:
+                try:
+                    frames.update(_fetch_chunk([series_id], http, timeout, start_date, end_date, cache, transform))
+                except Exception as e:
+                    print(f"   ❌ Lỗi khi tải {series_id}: {e}")
+
+    return frames
+
+
+async def _fetch_chunk_async(series_ids: List[str], session: aiohttp.ClientSession,
+                             semaphore: asyncio.Semaphore, limiter: HostRateLimiter,
+                             start_date: DateArg, end_date: DateArg,
+                             cache: Optional[FredCsvCache],
+                             transform: Optional[Transform] = None) -> Dict[str, pd.DataFrame]:
+    url = build_url(series_ids, start_date, end_date, transform)
+    keys = [series_key(series_id, transform) for series_id in series_ids]
+    headers = cache.validators(keys, url) if cache else {}
+
+    async with semaphore:
+        await limiter.acquire(url)
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                frames = cache.load_frames(keys)
+                if frames is not None:
+                    _print_not_modified(keys)
+                    return frames
+            else:
+                response.raise_for_status()
+                content = await response.read()
+                response_headers = response.headers
+
+        if response.status == 304:
+            # Mục cache hỏng: tải lại không kèm điều kiện rồi ghi đè mục cache
+            await limiter.acquire(url)
+            async with session.get(url) as response:
+                response.raise_for_status()
+                content = await response.read()
+                response_headers = response.headers
+
+    frames = _parse_body(content, series_ids)
+    frames = {series_key(series_id, transform): df for series_id, df in frames.items()}
+
+    if cache:
+        cache.store(keys, url, response_headers, frames)
+
+    return frames
+
+
+async def fetch_fred_csv_async(series_ids: Iterable[SeriesSpec], start_date: DateArg = None,
+                               end_date: DateArg = None, timeout: int = 30,
+                               cache: Optional[FredCsvCache] = None, batch_size: Optional[int] = None,
+                               max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                               requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                               session: Optional[aiohttp.ClientSession] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Phiên bản asyncio của fetch_fred_csv_batch: các nhóm series được tải song song.
+
+    - max_concurrency: số request đồng thời tối đa.
+    - requests_per_second: tốc độ tối đa tới mỗi host (token bucket).
+    - batch_size: số series tối đa mỗi request (mặc định chỉ giới hạn theo độ dài URL).
+
+    Kết quả (theo series_key) luôn theo thứ tự series_ids truyền vào, không phụ thuộc request nào xong trước.
+    """
+    series_ids = list(series_ids)
+    groups = _group_by_transform(series_ids)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = HostRateLimiter(requests_per_second)
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout))
+
+    async def fetch(chunk, transform):
+        try:
+            return await _fetch_chunk_async(chunk, session, semaphore, limiter, start_date, end_date,
+                                            cache, transform)
+        except Exception as e:
+            if len(chunk) == 1:
+                print(f"   ❌ Lỗi khi tải {chunk[0]}: {e}")
+                return {}
+            print(f"   ⚠️  Lỗi khi tải nhóm {len(chunk)} series ({e}), thử tải riêng từng series...")
+
+        results = await asyncio.gather(*(fetch([series_id], transform) for series_id in chunk))
+        return {key: df for result in results for key, df in result.items()}
+
+    try:
+        tasks = [
+            fetch(chunk, transform)
+            for transform, ids in groups
+            for chunk in chunk_series_ids(ids, start_date=start_date, end_date=end_date,
+                                          batch_size=batch_size, transform=transform)
+        ]
+        results = await asyncio.gather(*tasks)
+    finally:
+        if own_session:
+            await session.close()
+
+    merged = {key: df for result in results for key, df in result.items()}
+    keys = dict.fromkeys(series_key(*_split_spec(spec)) for spec in series_ids)
+    return {key: merged[key] for key in keys if key in merged}
+
+
+def fetch_fred_csv_concurrent(series_ids: Iterable[SeriesSpec], **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Gọi fetch_fred_csv_async từ code đồng bộ (các scraper không chạy trong event loop).
+    """
+    return asyncio.run(fetch_fred_csv_async(series_ids, **kwargs))
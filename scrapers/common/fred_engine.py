@@ -0,0 +1,64 @@
+"""
+Chạy tất cả scraper FRED CSV trong một lượt, mỗi series chỉ tải một lần.
+
+Engine lấy danh sách series của các output từ fred_registry, gộp các series trùng nhau
+(cùng ID và cùng transform) để mỗi series chỉ tải một lần, tải tất cả bằng một session dùng chung
+qua fetch_fred_csv_concurrent (các nhóm request chạy song song), rồi chuyển dữ liệu đã tải
+cho main(frames=...) của từng scraper để mỗi scraper tự ghi file output của mình.
+
+Chạy: python scrapers/common/fred_engine.py [--outputs fed_policy dxy_index ...]
+"""
+import argparse
+import importlib
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import FredCsvCache, fetch_fred_csv_concurrent, year_start
+from scrapers.common.fred_registry import outputs, unique_series
+
+# Output trong registry -> module scraper nhận main(frames=...)
+SCRAPER_MODULES = {
+    "commodity_prices": "scrapers.commodity_prices.scraper",
+    "fed_policy": "scrapers.fed_policy.scraper",
+    "dxy_index": "scrapers.dxy_index.scraper",
+    "us_macro": "scrapers.us_macro.scraper",
+    "commodity_cycles": "scrapers.commodity_cycles.scraper",
+}
+
+
+def fetch_all(output_names, start_year=2020):
+    """
+    Tải (một lần) tất cả series cần cho các output đã chọn.
+    Trả về dict {series_key: DataFrame(date, value)}.
+    """
+    series = unique_series(output_names)
+    print(f"📥 Đang tải {len(series)} series (không trùng) cho {len(output_names)} output...")
+
+    return fetch_fred_csv_concurrent(series, start_date=year_start(start_year), cache=FredCsvCache())
+
+
+def run(output_names=None, start_year=2020):
+    output_names = [name for name in (output_names or outputs()) if name in SCRAPER_MODULES]
+    frames = fetch_all(output_names, start_year)
+
+    for name in output_names:
+        print(f"\n{'=' * 60}\n▶️  {name}\n{'=' * 60}")
+        try:
+            module = importlib.import_module(SCRAPER_MODULES[name])
+            module.main(frames=frames)
+        except Exception as e:
+            print(f"❌ Lỗi khi chạy {name}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--outputs', nargs='+', choices=sorted(SCRAPER_MODULES),
+                        help="Chỉ chạy các output này (mặc định: tất cả)")
+    parser.add_argument('--start-year', type=int, default=2020)
+    args = parser.parse_args()
+
+    run(args.outputs, args.start_year)
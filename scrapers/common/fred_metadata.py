@@ -0,0 +1,91 @@
+"""
+Cache metadata series FRED (title, units, frequency, notes...) trên đĩa, dùng chung cho các scraper FRED API.
+
+Metadata gần như không đổi nên mỗi lần chạy chỉ cần tải observations; metadata chỉ được gọi lại
+khi mục cache quá TTL hoặc bị invalidate() (ví dụ qua cờ --refresh-metadata của scraper, hoặc khi series
+có dữ liệu mới, vì last_updated đổi mỗi lần FRED công bố).
+Scraper nào đã có sẵn metadata (như danh sách series theo category) thì put_many() để các scraper khác dùng lại.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_FILE = os.path.join(PROJECT_ROOT, ".cache", "fred_metadata.json")
+
+# Metadata series FRED hiếm khi thay đổi
+DEFAULT_TTL_HOURS = 24 * 7
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SeriesMetadataCache:
+    """
+    Cache {series_id: metadata} lưu trong một file JSON, mỗi mục kèm thời điểm tải (cached_at).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, series_id: str) -> Optional[dict]:
+        """
+        Metadata còn hạn của series, hoặc None nếu chưa có/đã quá TTL.
+        """
+        entry = self.entries.get(series_id)
+        if not entry:
+            return None
+        cached_at = datetime.strptime(entry["cached_at"], TIMESTAMP_FORMAT)
+        if datetime.now() - cached_at > self.ttl:
+            return None
+        return entry["metadata"]
+
+    def put(self, series_id: str, metadata: dict):
+        self.entries[series_id] = {
+            "cached_at": datetime.now().strftime(TIMESTAMP_FORMAT),
+            "metadata": metadata
+        }
+        self.dirty = True
+
+    def put_many(self, metadata_by_id: Dict[str, dict]):
+        for series_id, metadata in metadata_by_id.items():
+            self.put(series_id, metadata)
+
+    def get_or_fetch(self, series_id: str, fetch: Callable[[], dict]) -> dict:
+        """
+        Lấy metadata từ cache; nếu chưa có hoặc đã hết hạn thì gọi fetch() và lưu lại.
+        """
+        metadata = self.get(series_id)
+        if metadata is None:
+            metadata = fetch()
+            self.put(series_id, metadata)
+        return metadata
+
+    def invalidate(self, series_ids: Optional[Iterable[str]] = None):
+        """
+        Xóa metadata của các series đã cho (hoặc toàn bộ cache nếu series_ids là None).
+        """
+        if series_ids is None:
+            self.entries = {}
+        else:
+            for series_id in series_ids:
+                self.entries.pop(series_id, None)
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        self.dirty = False
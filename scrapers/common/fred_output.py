@@ -0,0 +1,142 @@
+"""
+Đọc/ghi file JSON output của các scraper FRED CSV và hỗ trợ chế độ incremental.
+
+Ở chế độ incremental, scraper đọc ngày cuối cùng đã lưu của từng series_id trong output cũ,
+chỉ tải các quan sát từ (ngày đó - lookback) trở đi, rồi ghép vào dữ liệu cũ. Cửa sổ lookback
+giúp bắt được các giá trị FRED sửa lại (revision) trong những ngày gần nhất.
+
+Schema compact (tùy chọn) lưu metadata một lần cho mỗi series cùng hai mảng song song
+dates/values, thay vì lặp lại indicator/category/unit/description trong từng quan sát:
+
+    {"schema": "fred-series-v1", "date_parts": ["year", "month", "day"],
+     "series": {"DFF": {"metadata": {...}, "dates": [...], "values": [...]}}}
+
+read_records() đọc được cả hai schema và luôn trả về các bản ghi phẳng như cũ.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+COMPACT_SCHEMA = "fred-series-v1"
+
+# Số ngày lùi lại so với quan sát cuối cùng để lấy lại các giá trị bị sửa
+DEFAULT_LOOKBACK_DAYS = 30
+
+
+def load_output(path: str) -> Optional[dict]:
+    """
+    Đọc file output JSON hiện có. Trả về None nếu file chưa có, rỗng hoặc hỏng.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_compact(output: Optional[dict]) -> bool:
+    return bool(output) and output.get("schema") == COMPACT_SCHEMA
+
+
+def to_compact(records: Iterable[dict], date_parts: Sequence[str]) -> dict:
+    """
+    Gom các bản ghi phẳng thành schema compact (metadata một lần cho mỗi series).
+    Trả về phần dict cần ghép vào output (schema, date_parts, series).
+    """
+    skip = {"date", "value", *date_parts}
+    series = {}
+
+    for record in records:
+        entry = series.get(record["series_id"])
+        if entry is None:
+            metadata = {key: value for key, value in record.items() if key not in skip}
+            entry = series[record["series_id"]] = {"metadata": metadata, "dates": [], "values": []}
+        entry["dates"].append(record["date"])
+        entry["values"].append(record["value"])
+
+    return {"schema": COMPACT_SCHEMA, "date_parts": list(date_parts), "series": series}
+
+
+def expand_compact(output: dict) -> List[dict]:
+    """
+    Chuyển schema compact về các bản ghi phẳng như output cũ (cùng key và thứ tự key).
+    """
+    date_parts = output.get("date_parts", [])
+    records = []
+
+    for entry in output["series"].values():
+        metadata = entry["metadata"]
+        for date_str, value in zip(entry["dates"], entry["values"]):
+            parts = {"year": int(date_str[0:4]), "month": int(date_str[5:7]), "day": int(date_str[8:10])}
+            record = {"date": date_str}
+            for part in date_parts:
+                record[part] = parts[part]
+            record["value"] = value
+            record.update(metadata)
+            records.append(record)
+
+    return records
+
+
+def read_records(output: Optional[dict]) -> Optional[List[dict]]:
+    """
+    Lấy danh sách bản ghi phẳng từ output đã đọc, bất kể schema phẳng hay compact.
+    """
+    if not output:
+        return None
+    if is_compact(output):
+        return expand_compact(output)
+    return output.get("data")
+
+
+def load_records(path: str) -> Optional[List[dict]]:
+    """
+    Đọc file output (phẳng hoặc compact) và trả về các bản ghi phẳng cho code cũ.
+    """
+    return read_records(load_output(path))
+
+
+def last_dates(records: Iterable[dict]) -> Dict[str, str]:
+    """
+    Ngày quan sát mới nhất (YYYY-MM-DD) của từng series_id.
+    """
+    latest = {}
+    for record in records:
+        series_id = record["series_id"]
+        if record["date"] > latest.get(series_id, ""):
+            latest[series_id] = record["date"]
+    return latest
+
+
+def incremental_start_dates(series_ids: Iterable[str], latest: Dict[str, str], default_start: str,
+                            lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Dict[str, str]:
+    """
+    Ngày bắt đầu tải (cosd) cho từng series: ngày cuối đã lưu trừ lookback_days,
+    hoặc default_start nếu series chưa có trong output.
+    """
+    start_dates = {}
+    for series_id in series_ids:
+        if series_id in latest:
+            start = datetime.strptime(latest[series_id], '%Y-%m-%d') - timedelta(days=lookback_days)
+            start_dates[series_id] = max(start.strftime('%Y-%m-%d'), default_start)
+        else:
+            start_dates[series_id] = default_start
+    return start_dates
+
+
+def merge_records(existing: List[dict], new_data: Dict[str, List[dict]],
+                  start_dates: Dict[str, str]) -> List[dict]:
+    """
+    Ghép dữ liệu mới vào output cũ.
+
+    Với mỗi series đã tải lại, các bản ghi cũ từ ngày bắt đầu cửa sổ trở đi được thay bằng
+    bản ghi mới (kể cả giá trị đã bị sửa). Series tải lỗi (không có trong new_data) giữ nguyên.
+    """
+    merged = [
+        record for record in existing
+        if record["series_id"] not in new_data or record["date"] < start_dates[record["series_id"]]
+    ]
+    for series_id, records in new_data.items():
+        merged.extend(record for record in records if record["date"] >= start_dates[series_id])
+    return merged
+
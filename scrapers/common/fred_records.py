@@ -0,0 +1,41 @@
+"""
+Chuyển DataFrame (date, value) của FRED thành list bản ghi JSON theo kiểu vectorized.
+
+Thay cho vòng lặp df.iterrows() trong từng scraper: việc parse ngày, loại bỏ giá trị '.'/NaN,
+tách year/month/day đều làm trên cả cột, sau đó các bản ghi được tạo trong một lượt duy nhất.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def frame_to_records(df: pd.DataFrame, metadata: Dict[str, object], start_year: Optional[int] = None,
+                     date_parts: Sequence[str] = ("year", "month")) -> List[Dict[str, object]]:
+    """
+    Tạo các bản ghi {date, <date_parts>, value, <metadata>} từ DataFrame (date, value).
+
+    - Giá trị '.' hoặc NaN bị loại bỏ.
+    - start_year (nếu có) lọc các quan sát trước năm đó.
+    - date_parts là các thành phần ngày cần thêm vào bản ghi, ví dụ ("year", "month", "day").
+    - metadata được gắn vào cuối mỗi bản ghi theo đúng thứ tự key truyền vào.
+    """
+    dates = pd.to_datetime(df['date'])
+    values = pd.to_numeric(df['value'], errors='coerce')
+
+    mask = values.notna()
+    if start_year:
+        mask &= dates.dt.year >= start_year
+
+    dates = dates[mask]
+    values = values[mask]
+
+    columns = {"date": np.datetime_as_string(dates.to_numpy(dtype='datetime64[D]'), unit='D').tolist()}
+    for part in date_parts:
+        columns[part] = getattr(dates.dt, part).tolist()
+    columns["value"] = values.astype(float).tolist()
+
+    keys = tuple(columns) + tuple(metadata)
+    static = tuple(metadata.values())
+
+    return [dict(zip(keys, row + static)) for row in zip(*columns.values())]
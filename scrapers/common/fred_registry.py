@@ -0,0 +1,270 @@
+"""
+Danh mục (registry) duy nhất cho các series FRED mà các scraper CSV sử dụng.
+
+Mỗi series khai báo metadata một lần và danh sách output (scraper) dùng nó trong "outputs".
+Giá trị của mỗi output là các trường ghi đè/bổ sung riêng cho scraper đó (ví dụ us_macro
+dùng "key" làm tên indicator). Series dùng chung nhiều output (như DTWEXBGS) chỉ khai báo một lần,
+nhờ đó fred_engine tải mỗi ID đúng một lần cho mỗi lượt chạy.
+
+Override có thể chứa "transform" ({"frequency": "m", "aggregation_method": "avg", "units": "pc1"})
+để FRED tính sẵn trước khi gửi; một output dùng cùng series với nhiều transform thì khai báo
+danh sách override. Mỗi cặp (series, transform) là một lần tải riêng, khóa theo fred_csv.series_key.
+
+Thêm series mới: thêm một mục vào SERIES với output tương ứng, không cần viết thêm vòng lặp tải.
+"""
+from typing import Dict, Iterable, List
+
+from scrapers.common.fred_csv import SeriesSpec, series_key
+
+SERIES = {
+    # ==================== commodity_prices ====================
+    # Năng lượng / Energy
+    "DCOILWTICO": {
+        "name": "Crude Oil - WTI",
+        "category": "Energy",
+        "unit": "USD per Barrel",
+        "outputs": {"commodity_prices": {}}
+    },
+    "DCOILBRENTEU": {
+        "name": "Crude Oil - Brent",
+        "category": "Energy",
+        "unit": "USD per Barrel",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PNGASEUUSDM": {
+        "name": "Natural Gas - Europe",
+        "category": "Energy",
+        "unit": "USD per Million BTU",
+        "outputs": {"commodity_prices": {}}
+    },
+
+    # Kim loại / Metals
+    "PCOPPUSDM": {
+        "name": "Copper",
+        "category": "Metals",
+        "unit": "USD per Metric Ton",
+        "outputs": {"commodity_prices": {}}
+    },
+    "WPU101": {
+        "name": "Steel - Iron and Steel (PPI)",
+        "category": "Metals",
+        "unit": "Index (PPI)",
+        "outputs": {"commodity_prices": {}}
+    },
+
+    # Nông sản / Agriculture
+    "PWHEAMTUSDM": {
+        "name": "Wheat",
+        "category": "Agriculture",
+        "unit": "USD per Metric Ton",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PMAIZMTUSDM": {
+        "name": "Maize (Corn)",
+        "category": "Agriculture",
+        "unit": "USD per Metric Ton",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PSOYBUSDQ": {
+        "name": "Soybeans",
+        "category": "Agriculture",
+        "unit": "USD per Metric Ton",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PCOFFOTMUSDM": {
+        "name": "Coffee",
+        "category": "Agriculture",
+        "unit": "USD per Kilogram",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PSUGAISAUSDM": {
+        "name": "Sugar",
+        "category": "Agriculture",
+        "unit": "USD per Kilogram",
+        "outputs": {"commodity_prices": {}}
+    },
+    "PRICENPUSDM": {
+        "name": "Rice",
+        "category": "Agriculture",
+        "unit": "USD per Metric Ton",
+        "outputs": {"commodity_prices": {}}
+    },
+
+    # Phân bón / Fertilizer
+    "PCU325311325311P": {
+        "name": "Fertilizer - Nitrogenous (Primary Products)",
+        "category": "Fertilizer",
+        "unit": "Index (PPI)",
+        "outputs": {"commodity_prices": {}}
+    },
+
+    # ==================== fed_policy ====================
+    "DFF": {
+        "name": "Effective Federal Funds Rate",
+        "category": "Interest Rate",
+        "unit": "Percent",
+        "description": "The interest rate at which depository institutions lend reserve balances to other depository institutions overnight",
+        "outputs": {"fed_policy": {}}
+    },
+    "DFEDTARU": {
+        "name": "Federal Funds Target Range - Upper Limit",
+        "category": "Policy Rate",
+        "unit": "Percent",
+        "description": "Upper limit of the target range for the federal funds rate",
+        "outputs": {"fed_policy": {}}
+    },
+    "DFEDTARL": {
+        "name": "Federal Funds Target Range - Lower Limit",
+        "category": "Policy Rate",
+        "unit": "Percent",
+        "description": "Lower limit of the target range for the federal funds rate",
+        "outputs": {"fed_policy": {}}
+    },
+
+    # ==================== dxy_index ====================
+    "DTWEXBGS": {
+        "name": "Trade Weighted U.S. Dollar Index: Broad, Goods and Services",
+        "category": "Broad Index",
+        "unit": "Index 2006=100",
+        "description": "A weighted average of the foreign exchange value of the U.S. dollar against the currencies of a broad group of major U.S. trading partners.",
+        "outputs": {
+            "dxy_index": {},
+            # us_macro chỉ dùng trung bình tháng và thay đổi so với cùng kỳ năm trước
+            "us_macro": [
+                {"key": "dxy", "transform": {"frequency": "m", "aggregation_method": "avg"}},
+                {"key": "dxy_yoy", "unit": "Percent Change from Year Ago",
+                 "transform": {"frequency": "m", "aggregation_method": "avg", "units": "pc1"}}
+            ]
+        }
+    },
+    "DTWEXEMEGS": {
+        "name": "Trade Weighted U.S. Dollar Index: Emerging Market Economies",
+        "category": "Emerging Markets",
+        "unit": "Index 2006=100",
+        "description": "A weighted average of the foreign exchange value of the U.S. dollar against currencies of emerging market economies.",
+        "outputs": {"dxy_index": {}}
+    },
+    "DTWEXAFEGS": {
+        "name": "Trade Weighted U.S. Dollar Index: Advanced Foreign Economies, Goods and Services",
+        "category": "Major Currencies",
+        "unit": "Index 2006=100",
+        "description": "A weighted average of the foreign exchange value of the U.S. dollar against currencies of advanced foreign economies (similar to major currencies).",
+        "outputs": {"dxy_index": {}}
+    },
+
+    # ==================== commodity_cycles ====================
+    # Chỉ số giá hàng hóa toàn cầu của IMF và các chỉ số thành phần
+    "PALLFNFINDEXM": {
+        "name": "Global Price Index of All Commodities",
+        "category": "Commodity Index",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of All Commodities, Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PNFUELINDEXM": {
+        "name": "Global Price Index of Non-Fuel Commodities",
+        "category": "Commodity Sub-Index - Non-Fuel",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Non-Fuel Commodities, Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PNRGINDEXM": {
+        "name": "Global Price Index of Energy",
+        "category": "Commodity Sub-Index - Energy",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Energy (crude oil, natural gas, coal, propane), Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PMETAINDEXM": {
+        "name": "Global Price Index of Metals",
+        "category": "Commodity Sub-Index - Metals",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Base Metals, Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PINDUINDEXM": {
+        "name": "Global Price Index of Industrial Materials",
+        "category": "Commodity Sub-Index - Industrial Materials",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Industrial Materials (agricultural raw materials and metals), Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PFANDBINDEXM": {
+        "name": "Global Price Index of Food and Beverage",
+        "category": "Commodity Sub-Index - Food and Beverage",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Food and Beverage, Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+    "PRAWMINDEXM": {
+        "name": "Global Price Index of Agricultural Raw Materials",
+        "category": "Commodity Sub-Index - Agricultural Raw Materials",
+        "unit": "Index 2016=100",
+        "description": "IMF Global Price Index of Agricultural Raw Materials, Monthly. Base Year 2016 = 100.",
+        "outputs": {"commodity_cycles": {}}
+    },
+
+    # ==================== us_macro ====================
+    "FEDFUNDS": {
+        "name": "Federal Funds Effective Rate",
+        "category": "Interest Rate",
+        "unit": "Percent",
+        "outputs": {"us_macro": {"key": "fed_funds_rate"}}
+    },
+    "DGS10": {
+        "name": "10-Year Treasury Constant Maturity Rate",
+        "category": "Interest Rate",
+        "unit": "Percent",
+        "outputs": {
+            "us_macro": [
+                {"key": "us_10y_yield", "transform": {"frequency": "m", "aggregation_method": "avg"}},
+                # Lợi suất là phần trăm nên dùng chênh lệch điểm phần trăm (ch1) thay vì % thay đổi
+                {"key": "us_10y_yield_yoy", "unit": "Percentage Points Change from Year Ago",
+                 "transform": {"frequency": "m", "aggregation_method": "avg", "units": "ch1"}}
+            ]
+        }
+    },
+}
+
+
+def _overrides(entry: dict, output: str) -> List[dict]:
+    overrides = entry["outputs"].get(output, [])
+    return overrides if isinstance(overrides, list) else [overrides]
+
+
+def series_for(output: str) -> Dict[str, dict]:
+    """
+    Các series của một output theo dạng {series_key: metadata}, giữ thứ tự khai báo trong SERIES.
+    Khóa là series ID (hoặc "ID@..." nếu có transform); metadata đã gộp các trường ghi đè riêng
+    của output đó (không còn khóa "outputs") và có thêm "series_id".
+    """
+    result = {}
+    for series_id, entry in SERIES.items():
+        for override in _overrides(entry, output):
+            metadata = {key: value for key, value in entry.items() if key != "outputs"}
+            metadata.update(override)
+            metadata["series_id"] = series_id
+            result[series_key(series_id, override.get("transform"))] = metadata
+    return result
+
+
+def outputs() -> List[str]:
+    """
+    Tất cả output được khai báo trong registry (theo thứ tự xuất hiện).
+    """
+    return list(dict.fromkeys(output for entry in SERIES.values() for output in entry["outputs"]))
+
+
+def unique_series(output_names: Iterable[str]) -> List[SeriesSpec]:
+    """
+    Danh sách series (không trùng) cần tải cho các output đã chọn: series ID, hoặc (series ID, transform).
+    Cùng series với transform khác nhau là các lần tải khác nhau.
+    """
+    specs = {}
+    for output in output_names:
+        for key, metadata in series_for(output).items():
+            transform = metadata.get("transform")
+            specs.setdefault(key, (metadata["series_id"], transform) if transform else metadata["series_id"])
+    # Giữ thứ tự khai báo trong SERIES
+    order = {series_id: index for index, series_id in enumerate(SERIES)}
+    return sorted(specs.values(), key=lambda spec: order[spec if isinstance(spec, str) else spec[0]])
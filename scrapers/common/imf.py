@@ -0,0 +1,294 @@
+"""
+Tải dữ liệu IMF DataMapper (WEO) dùng chung cho các scraper IMF (imf_gdp_growth, global_inflation...).
+
+- Mỗi indicator một request /api/v1/{indicator}/{entity}/...?periods=..., chỉ gồm các thực thể và năm cần dùng.
+- Các indicator được tải song song qua một aiohttp.ClientSession (một connection pool), tự thử lại khi gặp 429/5xx.
+- Dữ liệu được cache trên đĩa theo từng (indicator, thực thể), dùng chung giữa các scraper: scraper nào cần
+  một cặp đã có trong cache (cùng vintage WEO, đủ khoảng năm) thì không phải tải lại.
+
+Dữ liệu WEO chỉ đổi ở các kỳ công bố tháng 4 và tháng 10. Cache gắn với vintage WEO (ví dụ "October 2025")
+đọc từ trường source trong metadata /indicators của API. Metadata chỉ được hỏi lại khi theo lịch có thể đã có
+kỳ công bố mới hơn vintage đã lưu (tối đa một lần mỗi VINTAGE_CHECK_HOURS), nên chạy lại trong cùng một vintage
+không cần gọi mạng; khi xuất hiện vintage mới, mọi mục cache cũ tự hết hiệu lực và được tải lại.
+
+Kết quả có dạng {indicator: {entity: {year: value}}} như phần "values" trong response của DataMapper.
+"""
+import asyncio
+import json
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from scrapers.common.rate_limit import RETRY_STATUSES, retry_with_backoff
+
+BASE_URL = "https://www.imf.org/external/datamapper/api/v1"
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "imf")
+
+# Khoảng cách tối thiểu giữa hai lần hỏi metadata khi đang chờ một kỳ công bố WEO mới
+VINTAGE_CHECK_HOURS = 24
+
+# Các kỳ công bố WEO trong năm
+WEO_RELEASE_MONTHS = {"April": 4, "October": 10}
+_VINTAGE_PATTERN = re.compile(r"\b(April|October)\s+(\d{4})\b")
+
+DEFAULT_MAX_CONNECTIONS = 4
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# {indicator: {entity: {year: value}}}
+IndicatorData = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def parse_weo_vintage(source: Optional[str]) -> Optional[str]:
+    """
+    Vintage WEO trong trường source của metadata: "World Economic Outlook (October 2025)" -> "October 2025".
+    """
+    match = _VINTAGE_PATTERN.search(source or "")
+    return f"{match.group(1)} {match.group(2)}" if match else None
+
+
+def _vintage_key(vintage: str):
+    month, year = vintage.split()
+    return int(year), WEO_RELEASE_MONTHS[month]
+
+
+def expected_vintage(today: Optional[date] = None) -> str:
+    """
+    Kỳ công bố WEO gần nhất theo lịch (tháng 4 hoặc tháng 10 đã bắt đầu).
+    """
+    today = today or date.today()
+    if today.month >= 10:
+        return f"October {today.year}"
+    if today.month >= 4:
+        return f"April {today.year}"
+    return f"October {today.year - 1}"
+
+
+class ImfCache:
+    """
+    Cache trên đĩa, mỗi indicator một file {indicator}.json:
+    {entity: {"vintage", "fetched_at", "start_year", "end_year", "values": {year: value}}}
+    (mục "*" đánh dấu đã tải đủ mọi thực thể của indicator), cùng vintage.json lưu vintage WEO hiện tại và thời điểm kiểm tra gần nhất.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.vintage: Optional[str] = None
+
+    def _path(self, indicator: str) -> str:
+        return os.path.join(self.cache_dir, f"{indicator}.json")
+
+    def _load(self, indicator: str) -> dict:
+        try:
+            with open(self._path(indicator), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load_vintage(self) -> Optional[dict]:
+        """
+        Vintage đã lưu: {"vintage": "October 2025", "checked_at": ...}, hoặc None.
+        """
+        state = self._load("vintage")
+        return state if state.get("vintage") else None
+
+    def save_vintage(self, vintage: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path("vintage"), 'w', encoding='utf-8') as f:
+            json.dump({"vintage": vintage, "checked_at": datetime.now().strftime(TIMESTAMP_FORMAT)}, f, indent=2)
+
+    def _valid(self, entry: dict, start_year: int, end_year: int) -> bool:
+        return (entry.get("vintage") == self.vintage
+                and entry["start_year"] <= start_year and entry["end_year"] >= end_year)
+
+    def get(self, indicator: str, entities: List[str], start_year: int, end_year: int) -> Dict[str, dict]:
+        """
+        Dữ liệu cùng vintage hiện tại và đủ khoảng năm của các thực thể đã có trong cache,
+        theo dạng {entity: {year: value}}. Chưa xác định được vintage thì không dùng cache.
+        """
+        if self.vintage is None:
+            return {}
+        return {
+            entity: entry["values"] for entity, entry in self._load(indicator).items()
+            if entity in entities and self._valid(entry, start_year, end_year)
+        }
+
+    def get_all(self, indicator: str, start_year: int, end_year: int) -> Optional[Dict[str, dict]]:
+        """
+        Mọi thực thể của indicator nếu lần trước đã tải đủ (mục "*") và còn hợp lệ, ngược lại None.
+        Một thực thể bị put() riêng lẻ ghi lại với khoảng năm hẹp hơn thì mục "*" không còn đủ,
+        nên cũng trả về None để tải lại cả indicator.
+        """
+        entries = self._load(indicator)
+        marker = entries.pop("*", None)
+        if self.vintage is None or marker is None or not self._valid(marker, start_year, end_year):
+            return None
+        if not all(self._valid(entry, start_year, end_year) for entry in entries.values()):
+            return None
+        return {entity: entry["values"] for entity, entry in entries.items()}
+
+    def put(self, indicator: str, values: Dict[str, dict], start_year: int, end_year: int,
+            all_entities: bool = False):
+        entries = self._load(indicator)
+        fetched_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+        if all_entities:
+            values = {**values, "*": {}}
+        for entity, entity_values in values.items():
+            entries[entity] = {
+                "vintage": self.vintage,
+                "fetched_at": fetched_at,
+                "start_year": start_year,
+                "end_year": end_year,
+                "values": entity_values
+            }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(indicator), 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+
+
+def build_url(indicator: str, entities: Iterable[str], start_year: int, end_year: int) -> str:
+    # Không có thực thể nào trên đường dẫn thì API trả về mọi thực thể
+    # Dấu phẩy trong periods giữ nguyên (không mã hóa thành %2C)
+    periods = ",".join(str(year) for year in range(start_year, end_year + 1))
+    return "/".join([BASE_URL, indicator, *entities]) + f"?periods={periods}"
+
+
+def _in_range(values: Dict[str, float], start_year: int, end_year: int) -> Dict[str, float]:
+    return {year: value for year, value in values.items() if start_year <= int(year) <= end_year}
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str) -> dict:
+    async def attempt():
+        async with session.get(url) as response:
+            response.raise_for_status()
+            # DataMapper đôi khi trả JSON với content-type khác application/json
+            return await response.json(content_type=None)
+
+    return await retry_with_backoff(attempt, is_retryable)
+
+
+async def resolve_vintage(session: aiohttp.ClientSession, cache: ImfCache, indicators: List[str]) -> Optional[str]:
+    """
+    Xác định vintage WEO hiện tại và gán vào cache.vintage.
+
+    Dùng vintage đã lưu nếu nó không cũ hơn kỳ công bố gần nhất theo lịch, hoặc nếu vừa kiểm tra
+    trong VINTAGE_CHECK_HOURS; ngược lại đọc source của các indicator trong metadata /indicators.
+    """
+    state = cache.load_vintage()
+    if state:
+        checked_at = datetime.strptime(state["checked_at"], TIMESTAMP_FORMAT)
+        if (_vintage_key(state["vintage"]) >= _vintage_key(expected_vintage())
+                or datetime.now() - checked_at < timedelta(hours=VINTAGE_CHECK_HOURS)):
+            cache.vintage = state["vintage"]
+            return cache.vintage
+
+    try:
+        metadata = (await _get_json(session, f"{BASE_URL}/indicators")).get("indicators") or {}
+        vintages = [parse_weo_vintage((metadata.get(indicator) or {}).get("source")) for indicator in indicators]
+        vintage = max(filter(None, vintages), key=_vintage_key, default=None)
+    except Exception as e:
+        print(f"⚠️  Không đọc được metadata IMF ({e}), dùng vintage đã lưu")
+        vintage = None
+
+    if vintage:
+        if state is None or vintage != state["vintage"]:
+            print(f"🆕 IMF WEO vintage: {vintage}")
+        cache.save_vintage(vintage)
+    cache.vintage = vintage or (state or {}).get("vintage")
+    return cache.vintage
+
+
+async def _fetch_all_entities(session: aiohttp.ClientSession, indicator: str, start_year: int, end_year: int,
+                              cache: Optional[ImfCache]) -> Dict[str, dict]:
+    cached = cache.get_all(indicator, start_year, end_year) if cache else None
+    if cached is not None:
+        print(f"   ♻️  {indicator}: dùng cache")
+        return cached
+
+    print(f"📥 Đang tải {indicator} (tất cả thực thể)...")
+    payload = await _get_json(session, build_url(indicator, [], start_year, end_year))
+    indicator_values = (payload.get("values") or {}).get(indicator) or {}
+    fetched = {entity: values for entity, values in indicator_values.items() if values}
+
+    # Response rỗng không được đánh dấu "*" (đã tải đủ), lần chạy sau sẽ tải lại
+    if cache and fetched:
+        cache.put(indicator, fetched, start_year, end_year, all_entities=True)
+    return fetched
+
+
+async def _fetch_indicator(session: aiohttp.ClientSession, indicator: str, entities: Optional[List[str]],
+                           start_year: int, end_year: int, cache: Optional[ImfCache]) -> Dict[str, dict]:
+    if entities is None:
+        return await _fetch_all_entities(session, indicator, start_year, end_year, cache)
+
+    cached = cache.get(indicator, entities, start_year, end_year) if cache else {}
+    missing = [entity for entity in entities if entity not in cached]
+    if not missing:
+        print(f"   ♻️  {indicator}: dùng cache")
+        return cached
+
+    url = build_url(indicator, missing, start_year, end_year)
+    print(f"📥 Đang tải {indicator} ({', '.join(missing)})...")
+
+    payload = await _get_json(session, url)
+    indicator_values = (payload.get("values") or {}).get(indicator) or {}
+    # Chỉ cache thực thể có dữ liệu trong response: response rỗng/thiếu (lỗi tạm thời) không được
+    # che dữ liệu suốt cả vintage, lần chạy sau sẽ hỏi lại các thực thể này
+    fetched = {entity: indicator_values[entity] for entity in missing if indicator_values.get(entity)}
+
+    if cache and fetched:
+        cache.put(indicator, fetched, start_year, end_year)
+    return {**cached, **{entity: fetched.get(entity, {}) for entity in missing}}
+
+
+async def fetch_imf_indicators_async(indicators: Iterable[str], entities: Optional[Iterable[str]],
+                                     start_year: int, end_year: int, cache: Optional[ImfCache] = None,
+                                     timeout: int = 30,
+                                     max_connections: int = DEFAULT_MAX_CONNECTIONS) -> IndicatorData:
+    """
+    Tải song song các indicator cho các thực thể (None: mọi thực thể IMF) và năm start_year..end_year.
+    Indicator lỗi được bỏ qua (in cảnh báo). Kết quả theo thứ tự indicators truyền vào.
+    Có cache thì vintage WEO của dữ liệu nằm ở cache.vintage sau khi gọi.
+    """
+    indicators = list(indicators)
+    entities = list(entities) if entities is not None else None
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max_connections),
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as session:
+        if cache:
+            await resolve_vintage(session, cache, indicators)
+
+        async def fetch(indicator):
+            try:
+                return await _fetch_indicator(session, indicator, entities, start_year, end_year, cache)
+            except Exception as e:
+                print(f"❌ Lỗi khi tải {indicator}: {e}")
+                return None
+
+        results = await asyncio.gather(*(fetch(indicator) for indicator in indicators))
+
+    return {
+        indicator: {entity: _in_range(values, start_year, end_year) for entity, values in result.items()}
+        for indicator, result in zip(indicators, results) if result is not None
+    }
+
+
+def fetch_imf_indicators(indicators: Iterable[str], entities: Optional[Iterable[str]],
+                         start_year: int, end_year: int, **kwargs) -> IndicatorData:
+    """
+    Gọi fetch_imf_indicators_async từ code đồng bộ (các scraper không chạy trong event loop).
+    """
+    return asyncio.run(fetch_imf_indicators_async(indicators, entities, start_year, end_year, **kwargs))
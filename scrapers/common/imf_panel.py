@@ -0,0 +1,101 @@
+"""
+Dựng panel IMF (thực thể × năm cho mỗi indicator) từ dữ liệu của scrapers/common/imf.py bằng NumPy.
+
+Mỗi indicator là một mảng float64 dày đặc [thực thể, năm], ô không có dữ liệu là NaN. Vị trí của mọi
+điểm dữ liệu được tính theo từng thực thể bằng mảng NumPy (không tạo dict cho từng điểm), rồi gán một lần
+vào mảng của indicator.
+
+Panel được lưu thành Parquet: mỗi dòng là một (entity, year), mỗi indicator là một cột, nên có thể
+chỉ đọc các cột indicator cần dùng (load_panel(path, indicators=[...])).
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scrapers.common.imf import IndicatorData
+
+
+class Panel(NamedTuple):
+    entities: List[str]
+    years: np.ndarray
+    # {indicator: mảng float64 [len(entities), len(years)]}
+    values: Dict[str, np.ndarray]
+
+
+def build_panel(data: IndicatorData, entities: Optional[Iterable[str]] = None,
+                start_year: Optional[int] = None, end_year: Optional[int] = None) -> Panel:
+    """
+    Chuyển {indicator: {entity: {year: value}}} thành Panel.
+
+    entities/start_year/end_year mặc định lấy theo dữ liệu (mọi thực thể, năm nhỏ nhất đến lớn nhất);
+    điểm dữ liệu nằm ngoài các giới hạn này bị bỏ qua.
+    """
+    if entities is None:
+        entities = sorted({entity for by_entity in data.values() for entity in by_entity})
+    entities = list(entities)
+    entity_index = {entity: i for i, entity in enumerate(entities)}
+
+    # Mỗi series (indicator, entity) thành hai mảng năm/giá trị
+    series = {}
+    for indicator, by_entity in data.items():
+        series[indicator] = [
+            (entity_index[entity],
+             np.fromiter(values.keys(), dtype=np.int64, count=len(values)),
+             np.array(list(values.values()), dtype=np.float64))
+            for entity, values in by_entity.items() if values and entity in entity_index
+        ]
+
+    all_years = [years for parts in series.values() for _, years, _ in parts]
+    if start_year is None or end_year is None:
+        observed = np.concatenate(all_years) if all_years else np.array([0], dtype=np.int64)
+        start_year = int(observed.min()) if start_year is None else start_year
+        end_year = int(observed.max()) if end_year is None else end_year
+    years = np.arange(start_year, end_year + 1)
+
+    values = {}
+    for indicator, parts in series.items():
+        panel = np.full((len(entities), len(years)), np.nan)
+        if parts:
+            rows = np.concatenate([np.full(len(y), row) for row, y, _ in parts])
+            cols = np.concatenate([y for _, y, _ in parts]) - start_year
+            vals = np.concatenate([v for _, _, v in parts])
+            keep = (cols >= 0) & (cols < len(years))
+            panel[rows[keep], cols[keep]] = vals[keep]
+        values[indicator] = panel
+
+    return Panel(entities, years, values)
+
+
+def save_panel(panel: Panel, path: str):
+    """
+    Lưu panel ra Parquet dạng (entity, year, <indicator>...), mỗi indicator một cột.
+    """
+    n_entities, n_years = len(panel.entities), len(panel.years)
+    columns = {
+        "entity": pa.array(np.repeat(np.array(panel.entities, dtype=object), n_years),
+                           pa.string()).dictionary_encode(),
+        "year": pa.array(np.tile(panel.years, n_entities).astype(np.int16)),
+    }
+    for indicator, array in panel.values.items():
+        columns[indicator] = pa.array(array.ravel())
+    pq.write_table(pa.table(columns), path)
+
+
+def load_panel(path: str, indicators: Optional[Iterable[str]] = None) -> Panel:
+    """
+    Đọc panel đã lưu bằng save_panel; indicators giới hạn các cột cần đọc.
+    """
+    columns = None if indicators is None else ["entity", "year", *indicators]
+    table = pq.read_table(path, columns=columns)
+    years = np.unique(table.column("year").to_numpy())
+    if not len(years):
+        return Panel([], years, {name: np.empty((0, 0)) for name in table.column_names
+                                 if name not in ("entity", "year")})
+    entities = table.column("entity").to_pylist()[::len(years)]
+    values = {
+        name: table.column(name).to_numpy().reshape(len(entities), len(years))
+        for name in table.column_names if name not in ("entity", "year")
+    }
+    return Panel(entities, years, values)
@@ -0,0 +1,91 @@
+"""
+Giới hạn tốc độ request (token bucket) cho các fetcher asyncio.
+
+Mỗi host có một bucket riêng: bucket nạp `rate` token mỗi giây, chứa tối đa `capacity` token
+(cho phép burst ngắn). Mỗi request lấy một token, hết token thì chờ đến khi được nạp lại.
+
+retry_with_backoff thử lại các lỗi tạm thời (429, 5xx...) với thời gian chờ tăng theo cấp số nhân,
+ưu tiên header Retry-After nếu server gửi kèm.
+"""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+# Mã HTTP nên thử lại: quá giới hạn tốc độ và lỗi tạm thời phía server
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket dùng trong asyncio: acquire() chờ cho đến khi có token.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # Lock giữ thứ tự FIFO giữa các coroutine đang chờ token
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class HostRateLimiter:
+    """
+    Một AsyncTokenBucket cho mỗi host, tạo khi gặp host lần đầu.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets: Dict[str, AsyncTokenBucket] = {}
+
+    async def acquire(self, url: str):
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = AsyncTokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    # requests.HTTPError có error.response.headers, aiohttp.ClientResponseError có error.headers
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def retry_with_backoff(func: Callable[[], Awaitable[T]], should_retry: Callable[[Exception], bool],
+                             attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0) -> T:
+    """
+    Gọi await func(); nếu lỗi và should_retry(lỗi) thì chờ rồi thử lại, tối đa attempts lần.
+
+    Thời gian chờ là Retry-After (nếu có), ngược lại base_delay * 2^n có jitter, không quá max_delay.
+    """
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except Exception as e:
+            if attempt == attempts - 1 or not should_retry(e):
+                raise
+            delay = _retry_after(e) or min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            await asyncio.sleep(delay)
@@ -0,0 +1,132 @@
+"""
+Kho vintage (as-of) cho các series bị revise (GDP, CPI...), lưu theo delta.
+
+Mỗi series là một file JSONL chỉ ghi thêm, mỗi dòng là một vintage:
+- keyframe: toàn bộ observations {date: value} tại vintage đó
+- delta: chỉ các quan sát mới/bị revise ("set") và các ngày bị xóa ("removed") so với vintage trước
+
+Lần chạy không có thay đổi thì không ghi gì, nên dung lượng tăng theo số lần revise chứ không theo số lần chạy.
+Cứ keyframe_interval delta lại ghi một keyframe, nên as_of() chỉ phải áp tối đa chừng đó delta
+tính từ keyframe gần nhất trước ngày cần xem.
+"""
+import json
+import os
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_KEYFRAME_INTERVAL = 10
+
+DateArg = Union[str, date, None]
+
+# Mỗi dòng bắt đầu bằng {"vintage": ..., "kind": ...} (json.dumps giữ thứ tự key),
+# nên tìm vintage cần đọc mà không phải parse cả dòng
+_HEADER = re.compile(r'^\{"vintage": "([^"]+)", "kind": "(\w+)"')
+
+
+def _date_str(value: DateArg) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _to_records(snapshot: Dict[str, Optional[float]]) -> List[Dict[str, object]]:
+    return [{"date": d, "value": snapshot[d]} for d in sorted(snapshot)]
+
+
+class VintageStore:
+    """
+    Kho vintage theo series trong thư mục root: record() lưu observations của một lượt chạy,
+    as_of() dựng lại observations như đã thấy vào một ngày bất kỳ.
+    """
+
+    def __init__(self, root: str, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        self.root = root
+        self.keyframe_interval = keyframe_interval
+
+    def _path(self, series_id: str) -> str:
+        return os.path.join(self.root, f"{series_id}.jsonl")
+
+    def _lines(self, series_id: str) -> List[Tuple[str, str, str]]:
+        """
+        Các dòng của series theo dạng (vintage, kind, line); bỏ qua dòng ghi dở khi crash.
+        """
+        lines = []
+        try:
+            with open(self._path(series_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    match = _HEADER.match(line)
+                    if match and line.endswith("\n"):
+                        lines.append((match.group(1), match.group(2), line))
+        except OSError:
+            pass
+        return lines
+
+    @staticmethod
+    def _replay(lines: List[Tuple[str, str, str]]) -> Dict[str, Optional[float]]:
+        """
+        Áp các dòng (keyframe gần nhất rồi các delta sau nó) thành snapshot {date: value}.
+        """
+        start = max((i for i, (_, kind, _) in enumerate(lines) if kind == "keyframe"), default=0)
+        snapshot: Dict[str, Optional[float]] = {}
+        for _, kind, line in lines[start:]:
+            entry = json.loads(line)
+            if kind == "keyframe":
+                snapshot = dict(entry["observations"])
+            else:
+                snapshot.update(entry["set"])
+                for d in entry["removed"]:
+                    snapshot.pop(d, None)
+        return snapshot
+
+    def vintages(self, series_id: str) -> List[str]:
+        return [vintage for vintage, _, _ in self._lines(series_id)]
+
+    def as_of(self, series_id: str, as_of_date: DateArg = None) -> List[Dict[str, object]]:
+        """
+        Observations [{"date", "value"}] của series theo vintage mới nhất <= as_of_date
+        (mặc định: vintage mới nhất). Trả về [] nếu chưa có vintage nào trước ngày đó.
+        """
+        target = _date_str(as_of_date)
+        lines = self._lines(series_id)
+        if target is not None:
+            lines = [line for line in lines if line[0] <= target]
+        return _to_records(self._replay(lines))
+
+    def record(self, series_id: str, observations: Iterable[Dict[str, object]],
+               vintage: DateArg = None, start: DateArg = None) -> bool:
+        """
+        Lưu observations của lượt chạy này làm vintage mới (mặc định: hôm nay).
+
+        start: ngày đầu của khoảng đã tải (observation_start); các quan sát cũ hơn không có trong lượt tải
+        nên được giữ nguyên thay vì bị coi là đã xóa. Trả về False nếu không có gì thay đổi.
+        """
+        vintage = _date_str(vintage) or date.today().isoformat()
+        start = _date_str(start)
+        current = {obs["date"]: obs["value"] for obs in observations}
+
+        lines = self._lines(series_id)
+        previous = self._replay(lines)
+        changed = {d: v for d, v in current.items() if d not in previous or previous[d] != v}
+        removed = [d for d in previous if d not in current and (start is None or d >= start)]
+        if lines and not changed and not removed:
+            return False
+
+        deltas_since_keyframe = 0
+        for _, kind, _ in reversed(lines):
+            if kind == "keyframe":
+                break
+            deltas_since_keyframe += 1
+
+        if not lines or deltas_since_keyframe + 1 >= self.keyframe_interval:
+            snapshot = {**previous, **current}
+            for d in removed:
+                snapshot.pop(d, None)
+            entry = {"vintage": vintage, "kind": "keyframe", "observations": dict(sorted(snapshot.items()))}
+        else:
+            entry = {"vintage": vintage, "kind": "delta", "set": changed, "removed": removed}
+
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._path(series_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return True
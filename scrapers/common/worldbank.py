@@ -0,0 +1,315 @@
+"""
+Client asyncio cho World Bank API v2 (api.worldbank.org), dùng chung cho các scraper World Bank.
+
+- Nhiều quốc gia và nhiều indicator trong một request: /country/CHN;VNM/indicator/A;B?source=2
+  (API chỉ nhận nhiều indicator khi có tham số source; WDI là source=2).
+- Đọc metadata phân trang ở data[0] (page, pages, total): trang đầu cho biết số trang,
+  các trang còn lại được tải song song, nên không còn bị cắt dữ liệu ở per_page.
+- Một aiohttp.ClientSession (một connection pool) cho mọi request, tự thử lại khi gặp 429/5xx.
+
+Kết quả là danh sách observation gốc của API (mỗi phần tử có indicator, country, countryiso3code, date, value).
+
+Chế độ bulk (WdiBulkCache, load_wdi_bulk) dành cho phạm vi rộng (nhiều indicator WDI): tải archive
+WDI_CSV.zip một lần cho mỗi lần refresh, đọc WDICSV.csv theo từng khối ngay trong file zip (không giải nén
+cả file), chỉ giữ các quốc gia/indicator cần dùng và ghi ra một file Parquet. Các lần tra cứu sau đọc
+thẳng từ Parquet, không cần mạng.
+"""
+import asyncio
+import json
+import os
+import zipfile
+from typing import Iterable, List, Optional
+
+import aiohttp
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+from scrapers.common.rate_limit import RETRY_STATUSES, retry_with_backoff
+
+BASE_URL = "https://api.worldbank.org/v2"
+
+# World Development Indicators
+WDI_SOURCE = 2
+
+# Số indicator tối đa trong một request nhiều indicator của API
+MAX_INDICATORS_PER_REQUEST = 60
+
+DEFAULT_PER_PAGE = 1000
+DEFAULT_MAX_CONNECTIONS = 4
+
+# Archive CSV của toàn bộ WDI (một dòng cho mỗi (quốc gia, indicator), mỗi năm một cột)
+WDI_BULK_URL = "https://databank.worldbank.org/data/download/WDI_CSV.zip"
+WDI_BULK_MEMBER = "WDICSV.csv"
+# Danh mục quốc gia trong archive, dùng để đổi mã ISO2 ("2-alpha code") sang ISO3 ("Country Code")
+WDI_COUNTRY_MEMBER = "WDICountry.csv"
+# Số dòng CSV đọc mỗi lần khi lọc archive
+BULK_CHUNK_ROWS = 20000
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_BULK_DIR = os.path.join(PROJECT_ROOT, ".cache", "worldbank")
+
+
+def build_url(countries: List[str], indicators: List[str], start_year: int, end_year: int,
+              page: int = 1, per_page: int = DEFAULT_PER_PAGE, source: int = WDI_SOURCE) -> str:
+    url = (f"{BASE_URL}/country/{';'.join(countries)}/indicator/{';'.join(indicators)}"
+           f"?format=json&date={start_year}:{end_year}&per_page={per_page}&page={page}")
+    if len(indicators) > 1:
+        url += f"&source={source}"
+    return url
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+async def _get_page(session: aiohttp.ClientSession, url: str) -> list:
+    async def attempt():
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    payload = await retry_with_backoff(attempt, is_retryable)
+    # Lỗi của API (indicator/quốc gia không hợp lệ...) trả về 200 với [{"message": [...]}]
+    if not isinstance(payload, list) or not payload or "message" in payload[0]:
+        message = payload[0].get("message") if isinstance(payload, list) and payload else payload
+        raise ValueError(f"World Bank API error: {message}")
+    return payload
+
+
+async def _fetch_group(session: aiohttp.ClientSession, countries: List[str], indicators: List[str],
+                       start_year: int, end_year: int, per_page: int) -> List[dict]:
+    first = await _get_page(session, build_url(countries, indicators, start_year, end_year, 1, per_page))
+    pages = int(first[0].get("pages") or 1)
+
+    rest = await asyncio.gather(*(
+        _get_page(session, build_url(countries, indicators, start_year, end_year, page, per_page))
+        for page in range(2, pages + 1)
+    ))
+    return [item for payload in [first, *rest] for item in (payload[1] if len(payload) > 1 else None) or []]
+
+
+async def fetch_worldbank_async(indicators: Iterable[str], countries: Iterable[str],
+                                start_year: int, end_year: int, per_page: int = DEFAULT_PER_PAGE,
+                                timeout: int = 30, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                                session: Optional[aiohttp.ClientSession] = None) -> List[dict]:
+    """
+    Tải các indicator cho các quốc gia (mã ISO2/ISO3) và năm start_year..end_year.
+
+    Indicator được gom tối đa MAX_INDICATORS_PER_REQUEST mỗi request; các nhóm và các trang
+    đều tải song song. Nhóm lỗi được bỏ qua (in cảnh báo). Kết quả theo thứ tự nhóm, rồi thứ tự trang.
+    """
+    indicators = list(indicators)
+    countries = list(countries)
+    groups = [indicators[i:i + MAX_INDICATORS_PER_REQUEST]
+              for i in range(0, len(indicators), MAX_INDICATORS_PER_REQUEST)]
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_connections),
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+
+    async def fetch(group):
+        try:
+            return await _fetch_group(session, countries, group, start_year, end_year, per_page)
+        except Exception as e:
+            print(f"   ❌ Error fetching {', '.join(group)}: {e}")
+            return []
+
+    try:
+        results = await asyncio.gather(*(fetch(group) for group in groups))
+    finally:
+        if own_session:
+            await session.close()
+
+    return [item for result in results for item in result]
+
+
+def fetch_worldbank(indicators: Iterable[str], countries: Iterable[str],
+                    start_year: int, end_year: int, **kwargs) -> List[dict]:
+    """
+    Gọi fetch_worldbank_async từ code đồng bộ (các scraper không chạy trong event loop).
+    """
+    return asyncio.run(fetch_worldbank_async(indicators, countries, start_year, end_year, **kwargs))
+
+
+class WdiBulkCache:
+    """
+    Cache của chế độ bulk trong cache_dir: WDI_CSV.zip (kèm ETag/Last-Modified trong WDI_CSV.json)
+    và wdi.parquet dạng dài (country, indicator, year, value). Các quốc gia/indicator đã lọc
+    được lưu trong metadata của file Parquet (indicators = None nghĩa là mọi indicator).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_BULK_DIR):
+        self.cache_dir = cache_dir
+        self.zip_path = os.path.join(cache_dir, "WDI_CSV.zip")
+        self.meta_path = os.path.join(cache_dir, "WDI_CSV.json")
+        self.parquet_path = os.path.join(cache_dir, "wdi.parquet")
+
+    def download(self, refresh: bool = False, timeout: int = 300) -> bool:
+        """
+        Tải archive (stream xuống đĩa) nếu chưa có, hoặc khi refresh (conditional GET theo ETag/Last-Modified).
+        Trả về True nếu vừa tải archive mới.
+        """
+        if os.path.exists(self.zip_path) and not refresh:
+            return False
+
+        headers = {}
+        if os.path.exists(self.zip_path):
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        print(f"📥 Đang tải archive WDI ({WDI_BULK_URL})...")
+        with requests.get(WDI_BULK_URL, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 304:
+                print("   ♻️  Archive WDI không đổi (304), dùng bản đã tải")
+                return False
+            response.raise_for_status()
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.zip_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                for block in response.iter_content(chunk_size=1 << 20):
+                    f.write(block)
+            os.replace(tmp_path, self.zip_path)
+
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "url": WDI_BULK_URL,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }, f, indent=2)
+        return True
+
+    def _open_member(self, archive: zipfile.ZipFile, name: str):
+        member = next(member for member in archive.namelist()
+                      if os.path.basename(member).upper() == name.upper())
+        return archive.open(member)
+
+    def to_iso3(self, countries: List[str]) -> List[str]:
+        """
+        Đổi các mã ISO2 sang ISO3 theo WDICountry.csv trong archive (archive chỉ dùng ISO3); mã ISO3 giữ nguyên.
+        """
+        countries = [country.upper() for country in countries]
+        if all(len(country) == 3 for country in countries):
+            return countries
+
+        self.download()
+        with zipfile.ZipFile(self.zip_path) as archive, self._open_member(archive, WDI_COUNTRY_MEMBER) as f:
+            # keep_default_na=False: "NA" (Namibia) là mã hợp lệ, không phải giá trị thiếu
+            catalog = pd.read_csv(f, usecols=["Country Code", "2-alpha code"], dtype=str,
+                                  keep_default_na=False, encoding='utf-8-sig')
+        iso2_to_iso3 = dict(zip(catalog["2-alpha code"].str.upper(), catalog["Country Code"]))
+
+        unknown = [country for country in countries if len(country) != 3 and country not in iso2_to_iso3]
+        if unknown:
+            raise ValueError(f"Unknown country codes for the WDI archive (expected ISO3): {', '.join(unknown)}")
+        return [country if len(country) == 3 else iso2_to_iso3[country] for country in countries]
+
+    def scope(self) -> Optional[dict]:
+        """
+        {"countries": [...], "indicators": [...] | None} của wdi.parquet, hoặc None nếu chưa có.
+        """
+        try:
+            metadata = pq.read_schema(self.parquet_path).metadata or {}
+            return json.loads(metadata[b"scope"])
+        except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+            return None
+
+    def covers(self, countries: List[str], indicators: Optional[List[str]]) -> bool:
+        scope = self.scope()
+        if scope is None or not set(countries) <= set(scope["countries"]):
+            return False
+        if scope["indicators"] is None:
+            return True
+        return indicators is not None and set(indicators) <= set(scope["indicators"])
+
+    def ingest(self, countries: List[str], indicators: Optional[List[str]]):
+        """
+        Lọc WDICSV.csv trong archive theo quốc gia/indicator (gộp với phạm vi đã có) và ghi wdi.parquet.
+        """
+        scope = self.scope() or {"countries": [], "indicators": []}
+        countries = sorted(set(countries) | set(scope["countries"]))
+        if indicators is not None and scope["indicators"] is not None:
+            indicators = sorted(set(indicators) | set(scope["indicators"]))
+        else:
+            indicators = None
+
+        print(f"🗜️  Đang lọc {WDI_BULK_MEMBER} cho {len(countries)} quốc gia, "
+              f"{len(indicators) if indicators is not None else 'tất cả'} indicator...")
+        parts = []
+        with zipfile.ZipFile(self.zip_path) as archive:
+            with self._open_member(archive, WDI_BULK_MEMBER) as f:
+                for chunk in pd.read_csv(f, chunksize=BULK_CHUNK_ROWS, encoding='utf-8-sig'):
+                    keep = chunk["Country Code"].isin(countries)
+                    if indicators is not None:
+                        keep &= chunk["Indicator Code"].isin(indicators)
+                    if not keep.any():
+                        continue
+                    year_columns = [column for column in chunk.columns if str(column).isdigit()]
+                    long = chunk.loc[keep, ["Country Code", "Indicator Code", *year_columns]].melt(
+                        id_vars=["Country Code", "Indicator Code"], var_name="year", value_name="value"
+                    ).dropna(subset=["value"])
+                    parts.append(long)
+
+        columns = ["Country Code", "Indicator Code", "year", "value"]
+        frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        table = pa.table({
+            "country": pa.array(frame["Country Code"], pa.string()).dictionary_encode(),
+            "indicator": pa.array(frame["Indicator Code"], pa.string()).dictionary_encode(),
+            "year": pa.array(frame["year"].astype("int16")),
+            "value": pa.array(frame["value"].astype("float64")),
+        }).replace_schema_metadata({"scope": json.dumps({"countries": countries, "indicators": indicators})})
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pq.write_table(table, self.parquet_path)
+        print(f"   ✓ {table.num_rows} observations -> {self.parquet_path}")
+
+    def load(self, countries: List[str], indicators: Optional[List[str]],
+             start_year: int, end_year: int) -> pd.DataFrame:
+        filters = [("country", "in", list(countries)), ("year", ">=", start_year), ("year", "<=", end_year)]
+        if indicators is not None:
+            filters.append(("indicator", "in", list(indicators)))
+        frame = pq.read_table(self.parquet_path, filters=filters).to_pandas()
+        frame["country"] = frame["country"].astype(str)
+        frame["indicator"] = frame["indicator"].astype(str)
+        return frame.sort_values(["indicator", "country", "year"], ignore_index=True)
+
+
+def load_wdi_bulk(countries: Iterable[str], indicators: Optional[Iterable[str]], start_year: int, end_year: int,
+                  cache: Optional[WdiBulkCache] = None, refresh: bool = False) -> pd.DataFrame:
+    """
+    Dữ liệu WDI (country, indicator, year, value) từ archive bulk. indicators = None: mọi indicator.
+
+    Archive dùng mã ISO3: mã ISO2 được đổi sang ISO3 (cột country của kết quả luôn là ISO3),
+    mã ISO2 không có trong archive gây ValueError. Quốc gia không có dòng dữ liệu nào được in cảnh báo.
+
+    Không refresh và cache đã bao phủ các quốc gia/indicator thì không gọi mạng; ngược lại tải archive
+    (nếu chưa có hoặc khi refresh) rồi lọc lại vào cache.
+    """
+    cache = cache or WdiBulkCache()
+    countries = cache.to_iso3(list(countries))
+    indicators = list(indicators) if indicators is not None else None
+
+    if refresh or not cache.covers(countries, indicators):
+        downloaded = cache.download(refresh=refresh)
+        if downloaded or not cache.covers(countries, indicators):
+            cache.ingest(countries, indicators)
+
+    frame = cache.load(countries, indicators, start_year, end_year)
+    empty = sorted(set(countries) - set(frame["country"]))
+    if empty:
+        print(f"   ⚠️  No WDI data for {', '.join(empty)} ({start_year}-{end_year})")
+    return frame
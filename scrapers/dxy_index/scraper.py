@@ -1,87 +1,106 @@
 import os
+import sys
 import json
-import pandas as pd
 from datetime import datetime
 
+# Allow importing shared modules from scrapers/common when running this script directly
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import (
+    FredCsvCache, fetch_fred_csv_concurrent, year_start
+)
+from scrapers.common.fred_records import frame_to_records
+from scrapers.common.fred_registry import series_for
+from scrapers.common.fred_output import (
+    DEFAULT_LOOKBACK_DAYS, incremental_start_dates, is_compact, last_dates, load_output,
+    merge_records, read_records, to_compact
+)
+
 # Configuration
 DATA_DIR = os.path.dirname(__file__) + "/data"
 JSON_OUTPUT = os.path.join(DATA_DIR, "dxy_index.json")
 
-# Indicators
-INDICATORS = {
-    "DTWEXBGS": {
-        "name": "Trade Weighted U.S. Dollar Index: Broad, Goods and Services",
-        "category": "Broad Index",
-        "unit": "Index 2006=100",
-        "description": "A weighted average of the foreign exchange value of the U.S. dollar against the currencies of a broad group of major U.S. trading partners."
-    },
-    "DTWEXEMEGS": {
-        "name": "Trade Weighted U.S. Dollar Index: Emerging Market Economies",
-        "category": "Emerging Markets",
-        "unit": "Index 2006=100",
-        "description": "A weighted average of the foreign exchange value of the U.S. dollar against currencies of emerging market economies."
-    },
-    "DTWEXAFEGS": {
-        "name": "Trade Weighted U.S. Dollar Index: Advanced Foreign Economies, Goods and Services",
-        "category": "Major Currencies",
-        "unit": "Index 2006=100",
-        "description": "A weighted average of the foreign exchange value of the U.S. dollar against currencies of advanced foreign economies (similar to major currencies)."
-    }
-}
+# Indicators (declared in scrapers/common/fred_registry.py)
+INDICATORS = series_for("dxy_index")
+
+
+def build_records(df, series_id, info, start_year=2020):
+    """
+    Chuyển DataFrame (date, value) của một series thành list các bản ghi output.
+    """
+    return frame_to_records(df, {
+        "indicator": info["name"],
+        "category": info["category"],
+        "unit": info["unit"],
+        "description": info["description"],
+        "series_id": series_id
+    }, start_year=start_year, date_parts=("year", "month", "day"))
 
 
 def fetch_data(series_id, info, start_year=2020):
     """
-    Lấy dữ liệu trực tiếp từ FRED.
+    Lấy dữ liệu một indicator từ FRED, qua cùng đường tải với fetch_data_batch (cache, tải song song).
+    """
+    return fetch_data_batch({series_id: info}, start_year).get(series_id, [])
+
+
+def fetch_data_batch(indicators, start_year=2020, start_dates=None, frames=None):
     """
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    print(f"📥 Processing {info['name']} from {url}...")
+    Lấy dữ liệu tất cả indicators trong một (hoặc vài) request fredgraph.csv.
+    start_dates ({series_id: YYYY-MM-DD}) dùng cho chế độ incremental.
+    frames ({series_id: DataFrame}) là dữ liệu đã tải sẵn bởi fred_engine, khi đó không gọi FRED nữa.
+    Trả về dict {series_id: records}.
+    """
+    if frames is None:
+        print(f"📥 Processing {len(indicators)} series from FRED (batch)...")
+        frames = fetch_fred_csv_concurrent(indicators.keys(), start_date=start_dates or year_start(start_year),
+                                           cache=FredCsvCache())
     
-    try:
-        # Read directly from URL
-        df = pd.read_csv(url)
-        df.columns = ['date', 'value']
-        
-        # Filter data from start_year
-        df['date'] = pd.to_datetime(df['date'])
-        df = df[df['date'].dt.year >= start_year]
-        
-        records = []
-        for _, row in df.iterrows():
-            if pd.notna(row['value']) and row['value'] != '.':
-                records.append({
-                    "date": row['date'].strftime('%Y-%m-%d'),
-                    "year": row['date'].year,
-                    "month": row['date'].month,
-                    "day": row['date'].day,
-                    "value": float(row['value']),
-                    "indicator": info["name"],
-                    "category": info["category"],
-                    "unit": info["unit"],
-                    "description": info["description"],
-                    "series_id": series_id
-                })
-        
-        print(f"   ✅ Loaded {len(records)} records")
-        return records
+    results = {}
+    for series_id, info in indicators.items():
+        if series_id not in frames:
+            continue
+        results[series_id] = build_records(frames[series_id], series_id, info, start_year)
+        print(f"   ✅ {info['name']}: loaded {len(results[series_id])} records")
     
-    except Exception as e:
-        print(f"   ❌ Error processing {series_id}: {e}")
-        return []
+    return results
 
 
-def main():
+def main(incremental=False, lookback_days=DEFAULT_LOOKBACK_DAYS, start_year=2020, compact=False,
+         frames=None):
     print("--- DXY Index Scraper (Direct API) ---")
     
     all_data = []
     
-    for series_id, info in INDICATORS.items():
-        data = fetch_data(series_id, info)
-        all_data.extend(data)
+    # Incremental mode: only fetch observations after the last stored date (minus look-back)
+    previous_output = load_output(JSON_OUTPUT) if incremental else None
+    existing = read_records(previous_output)
+    start_dates = None
+    if existing:
+        start_dates = incremental_start_dates(
+            INDICATORS, last_dates(existing), year_start(start_year), lookback_days
+        )
+        print(f"🔁 Incremental: {len(existing)} existing records, look-back {lookback_days} days")
+    elif incremental:
+        print("⚠️  No existing output, fetching full window")
+    
+    batch_data = fetch_data_batch(INDICATORS, start_year, start_dates, frames)
+    if existing:
+        all_data = merge_records(existing, batch_data, start_dates)
+    else:
+        for series_id in INDICATORS:
+            all_data.extend(batch_data.get(series_id, []))
     
     # Sort
     all_data.sort(key=lambda x: (x["category"], x["date"]))
     
+    if existing and all_data == existing and is_compact(previous_output) == compact:
+        print("\n✅ No new data, output left unchanged")
+        print("\n🏁 Done!")
+        return
+    
     # Prepare output
     output_structure = {
         "source": "FRED (Federal Reserve Economic Data)",
@@ -89,8 +108,12 @@ def main():
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "total_records": len(all_data),
         "categories": list(set(c["category"] for c in all_data)),
-        "data": all_data
     }
+    if compact:
+        # Compact schema: metadata once per series, parallel dates/values arrays
+        output_structure.update(to_compact(all_data, ("year", "month", "day")))
+    else:
+        output_structure["data"] = all_data
     
     # Save to JSON
     # Ensure directory exists
@@ -98,7 +121,10 @@ def main():
     
     try:
         with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
-            json.dump(output_structure, f, indent=2, ensure_ascii=False)
+            if compact:
+                json.dump(output_structure, f, separators=(',', ':'), ensure_ascii=False)
+            else:
+                json.dump(output_structure, f, indent=2, ensure_ascii=False)
         print(f"\n💾 Saved {len(all_data)} records to {JSON_OUTPUT}")
         
     except Exception as e:
@@ -107,4 +133,14 @@ def main():
     print("\n🏁 Done!")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch new observations and merge them into the existing output")
+    parser.add_argument('--lookback-days', type=int, default=DEFAULT_LOOKBACK_DAYS,
+                        help="Days to re-fetch before the last stored date to pick up revisions")
+    parser.add_argument('--compact', action='store_true',
+                        help="Write the compact schema (metadata once per series)")
+    args = parser.parse_args()
+    
+    main(incremental=args.incremental, lookback_days=args.lookback_days, compact=args.compact)
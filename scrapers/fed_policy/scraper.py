@@ -1,10 +1,24 @@
 import os
+import sys
 import json
-import requests
-import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import (
+    FredCsvCache, fetch_fred_csv_concurrent, year_start
+)
+from scrapers.common.fred_records import frame_to_records
+from scrapers.common.fred_registry import series_for
+from scrapers.common.fred_output import (
+    DEFAULT_LOOKBACK_DAYS, incremental_start_dates, is_compact, last_dates, load_output,
+    merge_records, read_records, to_compact
+)
+
 # Load environment variables
 load_dotenv()
 
@@ -12,83 +26,73 @@ load_dotenv()
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 JSON_OUTPUT = os.path.join(DATA_DIR, "fed_policy.json")
 
-# FRED Series IDs for Fed Policy Indicators
-FED_INDICATORS = {
-    "DFF": {
-        "name": "Effective Federal Funds Rate",
-        "category": "Interest Rate",
-        "unit": "Percent",
-        "description": "The interest rate at which depository institutions lend reserve balances to other depository institutions overnight"
-    },
-    "DFEDTARU": {
-        "name": "Federal Funds Target Range - Upper Limit",
-        "category": "Policy Rate",
-        "unit": "Percent",
-        "description": "Upper limit of the target range for the federal funds rate"
-    },
-    "DFEDTARL": {
-        "name": "Federal Funds Target Range - Lower Limit",
-        "category": "Policy Rate",
-        "unit": "Percent",
-        "description": "Lower limit of the target range for the federal funds rate"
-    }
-}
+# FRED Series IDs for Fed Policy Indicators (khai báo trong scrapers/common/fred_registry.py)
+FED_INDICATORS = series_for("fed_policy")
+
+
+def build_fed_records(df, series_id, indicator_info, start_year=2020):
+    """
+    Chuyển DataFrame (date, value) của một series thành list các bản ghi output.
+    """
+    return frame_to_records(df, {
+        "indicator": indicator_info["name"],
+        "category": indicator_info["category"],
+        "unit": indicator_info["unit"],
+        "description": indicator_info["description"],
+        "series_id": series_id
+    }, start_year=start_year, date_parts=("year", "month", "day"))
 
 
 def fetch_fed_data(series_id, indicator_info, start_year=2020):
     """
-    Lấy dữ liệu Fed Policy từ FRED API.
+    Lấy dữ liệu một chỉ số Fed Policy từ FRED, qua cùng đường tải với fetch_fed_data_batch (cache, tải song song).
     """
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Parse CSV data
-        from io import StringIO
-        df = pd.read_csv(StringIO(response.text))
-        
-        # Column names: observation_date, {series_id}
-        df.columns = ['date', 'value']
-        
-        # Filter data từ start_year
-        df['date'] = pd.to_datetime(df['date'])
-        df = df[df['date'].dt.year >= start_year]
-        
-        # Convert to list of dicts
-        records = []
-        for _, row in df.iterrows():
-            if pd.notna(row['value']) and row['value'] != '.':
-                records.append({
-                    "date": row['date'].strftime('%Y-%m-%d'),
-                    "year": row['date'].year,
-                    "month": row['date'].month,
-                    "day": row['date'].day,
-                    "value": float(row['value']),
-                    "indicator": indicator_info["name"],
-                    "category": indicator_info["category"],
-                    "unit": indicator_info["unit"],
-                    "description": indicator_info["description"],
-                    "series_id": series_id
-                })
-        
-        return records
+    return fetch_fed_data_batch({series_id: indicator_info}, start_year).get(series_id, [])
+
+
+def fetch_fed_data_batch(indicators, start_year=2020, start_dates=None, frames=None):
+    """
+    Lấy dữ liệu nhiều chỉ số Fed Policy trong một (hoặc vài) request fredgraph.csv.
+    start_dates ({series_id: YYYY-MM-DD}) dùng cho chế độ incremental.
+    frames ({series_id: DataFrame}) là dữ liệu đã tải sẵn bởi fred_engine, khi đó không gọi FRED nữa.
+    Trả về dict {series_id: records}.
+    """
+    if frames is None:
+        frames = fetch_fred_csv_concurrent(indicators.keys(), start_date=start_dates or year_start(start_year),
+                                           cache=FredCsvCache())
     
-    except Exception as e:
-        print(f"   ❌ Lỗi khi tải {series_id}: {e}")
-        return []
+    return {
+        series_id: build_fed_records(frames[series_id], series_id, indicator_info, start_year)
+        for series_id, indicator_info in indicators.items()
+        if series_id in frames
+    }
 
 
-def main():
+def main(incremental=False, lookback_days=DEFAULT_LOOKBACK_DAYS, start_year=2020, compact=False,
+         frames=None):
     print("--- Fed Policy Indicators Scraper (FRED) ---\n")
     
     all_data = []
     
+    # Chế độ incremental: chỉ tải dữ liệu sau ngày cuối cùng đã lưu (trừ lookback)
+    previous_output = load_output(JSON_OUTPUT) if incremental else None
+    existing = read_records(previous_output)
+    start_dates = None
+    if existing:
+        start_dates = incremental_start_dates(
+            FED_INDICATORS, last_dates(existing), year_start(start_year), lookback_days
+        )
+        print(f"🔁 Incremental: {len(existing)} bản ghi có sẵn, lookback {lookback_days} ngày")
+    elif incremental:
+        print("⚠️  Chưa có output cũ, tải toàn bộ dữ liệu")
+    
+    print(f"📥 Đang tải {len(FED_INDICATORS)} chỉ số từ FRED (batch)...\n")
+    batch_data = fetch_fed_data_batch(FED_INDICATORS, start_year, start_dates, frames)
+    
     for series_id, indicator_info in FED_INDICATORS.items():
-        print(f"📥 Đang tải {indicator_info['name']}...")
+        print(f"📥 {indicator_info['name']}...")
         
-        data = fetch_fed_data(series_id, indicator_info)
+        data = batch_data.get(series_id, [])
         
         if data:
             all_data.extend(data)
@@ -96,9 +100,17 @@ def main():
         else:
             print(f"   ⚠️  Không có dữ liệu")
     
+    if existing:
+        all_data = merge_records(existing, batch_data, start_dates)
+    
     # Sắp xếp theo category, indicator, date
     all_data.sort(key=lambda x: (x["category"], x["indicator"], x["date"]))
     
+    if existing and all_data == existing and is_compact(previous_output) == compact:
+        print("\n✅ Không có dữ liệu mới, giữ nguyên file output")
+        print("\n🏁 Hoàn thành!")
+        return
+    
     # Chuẩn bị output
     output_structure = {
         "source": "Federal Reserve Economic Data (FRED)",
@@ -107,8 +119,12 @@ def main():
         "total_records": len(all_data),
         "categories": list(set(c["category"] for c in all_data)),
         "indicators": list(set(c["indicator"] for c in all_data)),
-        "data": all_data
     }
+    if compact:
+        # Schema compact: metadata một lần cho mỗi series, dates/values là mảng song song
+        output_structure.update(to_compact(all_data, ("year", "month", "day")))
+    else:
+        output_structure["data"] = all_data
     
     # Đảm bảo thư mục data tồn tại
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -116,7 +132,10 @@ def main():
     # Lưu vào file JSON (ghi đè)
     try:
         with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
-            json.dump(output_structure, f, indent=2, ensure_ascii=False)
+            if compact:
+                json.dump(output_structure, f, separators=(',', ':'), ensure_ascii=False)
+            else:
+                json.dump(output_structure, f, indent=2, ensure_ascii=False)
         print(f"\n💾 Đã lưu {len(all_data)} bản ghi vào {JSON_OUTPUT}")
         
         # Thống kê theo category
@@ -141,4 +160,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--incremental', action='store_true',
+                        help="Chỉ tải dữ liệu mới và ghép vào output hiện có")
+    parser.add_argument('--lookback-days', type=int, default=DEFAULT_LOOKBACK_DAYS,
+                        help="Số ngày lùi lại để lấy các giá trị bị sửa (revision)")
+    parser.add_argument('--compact', action='store_true',
+                        help="Ghi output theo schema compact (metadata một lần cho mỗi series)")
+    args = parser.parse_args()
+    
+    main(incremental=args.incremental, lookback_days=args.lookback_days, compact=args.compact)
@@ -1,8 +1,7 @@
 import os
+import sys
 import json
-import pandas as pd
 from datetime import datetime, timedelta
-from fredapi import Fred
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -14,6 +13,12 @@ PROJECT_ROOT = CURRENT_DIR.parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 ENV_PATH = PROJECT_ROOT / ".env"
 
+# Allow importing shared modules from scrapers/common when running this script directly
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.common.fred_api import FredClient
+
 # Load environment variables from project root
 load_dotenv(ENV_PATH)
 
@@ -37,11 +42,7 @@ def fetch_fred_data(api_key: str, series_ids: list):
         return None
 
     print("🚀 Connecting to FRED API...")
-    try:
-        fred = Fred(api_key=api_key)
-    except Exception as e:
-        print(f"❌ Error initializing Fred client: {e}")
-        return None
+    fred = FredClient(api_key)
 
     # Calculate start date (365 days ago)
     end_date = datetime.now()
@@ -53,23 +54,8 @@ def fetch_fred_data(api_key: str, series_ids: list):
     for series_id in series_ids:
         print(f"📥 Fetching series: {series_id}...")
         try:
-            # Fetch data
-            # observation_start expects string or datetime
-            series_data = fred.get_series(series_id, observation_start=start_date)
-            
-            # Convert to list of dicts
-            processed_data = []
-            for date, value in series_data.items():
-                # Handle NaN/None values
-                if pd.isna(value):
-                    clean_value = None
-                else:
-                    clean_value = float(value)
-                
-                processed_data.append({
-                    "date": date.strftime('%Y-%m-%d'),
-                    "value": clean_value
-                })
+            # Fetch data, already decoded into [{"date", "value"}] (missing values are None)
+            processed_data = fred.observations(series_id, observation_start=start_date.strftime('%Y-%m-%d'))
             
             all_data[series_id] = processed_data
             print(f"   ✅ Retrieved {len(processed_data)} data points.")
@@ -78,6 +64,7 @@ def fetch_fred_data(api_key: str, series_ids: list):
             print(f"   ❌ Failed to fetch {series_id}: {e}")
             all_data[series_id] = []
 
+    fred.close()
     return all_data
 
 def save_to_json(data: dict):
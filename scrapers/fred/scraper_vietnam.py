@@ -1,14 +1,25 @@
 import os
+import sys
 import json
 from datetime import date, timedelta
-from fredapi import Fred
-import pandas as pd
 from dotenv import load_dotenv
 
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_api import FredClient
+from scrapers.common.fred_metadata import SeriesMetadataCache
+from scrapers.common.vintage_store import VintageStore
+
 # Setup paths
 OUTPUT_DIR = 'scrapers/fred/data'
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'vietnam_macro_fred.json')
 
+# Các vintage (dữ liệu như đã thấy ở mỗi lần chạy) lưu theo delta, để xem lại số liệu trước khi bị revise
+VINTAGE_DIR = os.path.join(OUTPUT_DIR, 'vintages')
+
 # Target Series
 TARGETS = {
     'CCUSMA02VNM618N': 'Exchange Rate (Monthly - VND/USD)',
@@ -16,7 +27,29 @@ TARGETS = {
     'MKTGDPVNA646NWDB': 'GDP (Annual - USD)'
 }
 
-def main():
+def export_as_of(as_of_date):
+    """
+    Dựng lại observations của các series như đã thấy vào ngày as_of_date từ kho vintage (không gọi FRED).
+    """
+    vintages = VintageStore(VINTAGE_DIR)
+    output_file = os.path.join(OUTPUT_DIR, f'vietnam_macro_fred_as_of_{as_of_date}.json')
+    data = {}
+    for series_id in TARGETS.keys():
+        observations = vintages.as_of(series_id, as_of_date)
+        data[series_id] = {
+            "latest_value_date": observations[-1]["date"] if observations else "N/A",
+            "observations_count": len(observations),
+            "observations": observations
+        }
+        print(f"  -> {series_id}: {len(observations)} observations as of {as_of_date}")
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({"source": "FRED (St. Louis Fed)", "as_of": as_of_date, "data": data}, f,
+                  indent=2, ensure_ascii=False)
+    print(f"\nDone! Data saved to: {output_file}")
+
+
+def main(refresh_metadata=False):
     load_dotenv()
     api_key = os.getenv('FRED_API_KEY')
     
@@ -24,11 +57,8 @@ def main():
         print("Error: FRED_API_KEY not found in .env file.")
         return
 
-    try:
-        fred = Fred(api_key=api_key)
-    except Exception as e:
-        print(f"Error initializing Fred: {e}")
-        return
+    # Một client (giữ kết nối) cho mọi request trong lượt chạy
+    fred = FredClient(api_key)
 
     # Time Filter: Lấy 5 năm gần nhất để chắc chắn bao phủ cả dữ liệu công bố chậm (như GDP)
     today = date.today()
@@ -44,31 +74,29 @@ def main():
         "data": {}
     }
 
+    # Metadata lấy từ cache (TTL), mỗi series thường chỉ còn một request observations
+    metadata_cache = SeriesMetadataCache()
+    if refresh_metadata:
+        metadata_cache.invalidate(TARGETS.keys())
+
+    vintages = VintageStore(VINTAGE_DIR)
+
     for series_id in TARGETS.keys():
         print(f"\nProcessing: {series_id}...")
         
         try:
-            # 1. Get Metadata (Thông tin chi tiết về chỉ số)
-            info = fred.get_series_info(series_id)
-            
-            # 2. Get Data (Dữ liệu quan sát)
-            series_data = fred.get_series(series_id, observation_start=start_date_str)
-            
-            observations = []
-            latest_date = "N/A"
-            
-            for timestamp, value in series_data.items():
-                date_str = timestamp.strftime('%Y-%m-%d')
-                latest_date = date_str # Cập nhật ngày mới nhất
-                
-                cleaned_value = None
-                if pd.notna(value):
-                    cleaned_value = float(value)
-                
-                observations.append({
-                    "date": date_str,
-                    "value": cleaned_value
-                })
+            # 1. Get Data (Dữ liệu quan sát), đã ở dạng [{"date", "value"}] theo thứ tự ngày tăng dần
+            observations = fred.observations(series_id, observation_start=start_date_str)
+            latest_date = observations[-1]["date"] if observations else "N/A"
+
+            # Lưu vintage mới nếu có quan sát mới hoặc bị revise so với lần chạy trước
+            revised = vintages.record(series_id, observations, start=start_date_str)
+
+            # 2. Get Metadata (Thông tin chi tiết về chỉ số), từ cache nếu còn hạn.
+            # Có dữ liệu mới thì last_updated trong cache đã cũ, tải lại metadata của series
+            if revised:
+                metadata_cache.invalidate([series_id])
+            info = metadata_cache.get_or_fetch(series_id, lambda: fred.series_info(series_id))
             
             # Sắp xếp lại để ngày mới nhất lên đầu (nếu muốn)
             # observations.sort(key=lambda x: x['date'], reverse=True)
@@ -90,11 +118,15 @@ def main():
             print(f"  -> Title: {info.get('title')}")
             print(f"  -> Latest Date Found: {latest_date}")
             print(f"  -> Units: {info.get('units')}")
+            print(f"  -> Vintage: {'new data/revisions stored' if revised else 'unchanged'}")
 
         except Exception as e:
             print(f"  -> Error fetching {series_id}: {e}")
             final_data_structure["data"][series_id] = {"error": str(e)}
 
+    metadata_cache.save()
+    fred.close()
+
     # Save Output
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -103,4 +135,15 @@ def main():
     print(f"\nDone! Data saved to: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--refresh-metadata', action='store_true',
+                        help="Bỏ qua cache metadata và tải lại metadata của các series")
+    parser.add_argument('--as-of', metavar='YYYY-MM-DD',
+                        help="Không gọi FRED, xuất dữ liệu như đã thấy vào ngày này từ kho vintage")
+    args = parser.parse_args()
+
+    if args.as_of:
+        export_as_of(args.as_of)
+    else:
+        main(refresh_metadata=args.refresh_metadata)
\ No newline at end of file
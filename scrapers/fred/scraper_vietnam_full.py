@@ -1,111 +1,188 @@
 import os
+import sys
 import json
-import time
-from datetime import datetime
-from fredapi import Fred
-import pandas as pd
+import asyncio
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Chỉ cần cho chế độ --history
+    pa = None
+
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.checkpoint import CheckpointJournal
+from scrapers.common.fred_api import AsyncFredClient
+from scrapers.common.fred_metadata import SeriesMetadataCache
+
 # Setup
 OUTPUT_DIR = 'scrapers/fred/data'
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'vietnam_all_indicators.json')
 ROOT_CATEGORY_ID = 32841  # Vietnam
 
-def get_all_series_ids(fred, category_id, found_series=None, processed_categories=None):
+# Cây category đã quét (category -> category con), dùng lại ở các lần chạy sau
+TREE_FILE = os.path.join(OUTPUT_DIR, 'vietnam_category_tree.json')
+TREE_TTL_DAYS = 7
+
+# Journal tiến độ (series đã tìm thấy, giá trị đã tải) để --resume tiếp tục khi lượt chạy bị gián đoạn
+JOURNAL_FILE = os.path.join(OUTPUT_DIR, 'vietnam_all_indicators.journal.jsonl')
+
+# Chế độ --history: toàn bộ lịch sử từng series, mỗi series một file Parquet,
+# phân vùng theo tần suất: vietnam_history/frequency=monthly/VNMCPIALLMINMEI.parquet
+HISTORY_DIR = os.path.join(OUTPUT_DIR, 'vietnam_history')
+
+# Số request đồng thời tối đa (tốc độ do token bucket của AsyncFredClient giới hạn theo FRED)
+MAX_WORKERS = 8
+
+
+async def get_category_series(fred, category_id):
     """
-    Đệ quy tìm tất cả Series ID trong category cha và các category con.
+    Metadata các series nằm trực tiếp trong category, theo dạng {series_id: metadata}.
     """
-    if found_series is None:
-        found_series = {}
-    if processed_categories is None:
-        processed_categories = set()
+    found_series = {}
+    for row in await fred.category_series(category_id):
+        found_series[row['id']] = {
+            'id': row['id'],
+            'title': row['title'],
+            'units': row['units'],
+            'frequency': row['frequency'],
+            'seasonal_adjustment': row['seasonal_adjustment'],
+            'notes': row.get('notes', ''),
+            # Thời điểm FRED cập nhật series lần cuối, dùng để bỏ qua series không đổi
+            'last_updated': row.get('last_updated')
+        }
+    return found_series
 
-    if category_id in processed_categories:
-        return found_series
-    
-    processed_categories.add(category_id)
-    print(f"📂 Scanning Category ID: {category_id}...")
 
-    try:
-        # 1. Lấy danh sách Series trực tiếp trong Category này
-        # limit=1000 để đảm bảo lấy hết (mặc định thường ít hơn)
-        series_in_cat = fred.search_by_category(category_id, limit=1000)
-        
-        if not series_in_cat.empty:
-            for _, row in series_in_cat.iterrows():
-                sid = row['id']
-                if sid not in found_series:
-                    found_series[sid] = {
-                        'id': sid,
-                        'title': row['title'],
-                        'units': row['units'],
-                        'frequency': row['frequency'],
-                        'seasonal_adjustment': row['seasonal_adjustment'],
-                        'notes': row.get('notes', '')
-                    }
-
-        # 2. Lấy danh sách Category con (Children)
-        children = fred.get_child_categories(category_id)
-        if not children.empty:
-            for child_id in children.index: # children index is the category id
-                get_all_series_ids(fred, child_id, found_series, processed_categories)
-                
-    except Exception as e:
-        print(f"⚠️ Error scanning category {category_id}: {e}")
+async def scan_categories(fred, root_id, known_children=None, max_workers=MAX_WORKERS):
+    """
+    Duyệt cây category theo chiều rộng (BFS) bằng một nhóm worker asyncio.
+
+    Mọi lời gọi đi qua AsyncFredClient (chung token bucket theo giới hạn của FRED,
+    tự thử lại khi gặp 429/5xx). known_children ({category_id: [child_id, ...]}) lấy từ cây đã lưu:
+    category có trong đó không cần gọi category/children nữa, nên mọi category được quét song song ngay.
+
+    Trả về {category_id: {"children": [...], "series": {series_id: metadata}}}.
+    """
+    known_children = known_children or {}
+    queue = asyncio.Queue()
+    processed_categories = set()
+    categories = {}
+
+    def enqueue(category_id):
+        # Chống lặp vô hạn nếu một category xuất hiện ở nhiều nhánh
+        if category_id not in processed_categories:
+            processed_categories.add(category_id)
+            queue.put_nowait(category_id)
+
+    async def worker():
+        while True:
+            category_id = await queue.get()
+            try:
+                print(f"📂 Scanning Category ID: {category_id}...")
+                series = await get_category_series(fred, category_id)
+                children = known_children.get(category_id)
+                if children is None:
+                    children = await fred.category_children(category_id)
+                categories[category_id] = {"children": children, "series": series}
+                for child_id in children:
+                    enqueue(child_id)
+            except Exception as e:
+                print(f"⚠️ Error scanning category {category_id}: {e}")
+            finally:
+                queue.task_done()
 
+    enqueue(root_id)
+    workers = [asyncio.create_task(worker()) for _ in range(max_workers)]
+    await queue.join()
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    return categories
+
+
+def collect_series(categories, root_id):
+    """
+    Gom series của cả cây theo thứ tự duyệt category cha trước, con sau (như bản đệ quy cũ),
+    để thứ tự output không phụ thuộc request nào xong trước.
+    """
+    found_series = {}
+    stack = [root_id]
+    visited = set()
+    while stack:
+        category_id = stack.pop()
+        if category_id in visited or category_id not in categories:
+            continue
+        visited.add(category_id)
+        for sid, meta in categories[category_id]["series"].items():
+            found_series.setdefault(sid, meta)
+        stack.extend(reversed(categories[category_id]["children"]))
     return found_series
 
-def main():
-    load_dotenv()
-    api_key = os.getenv('FRED_API_KEY')
-    if not api_key:
-        print("Error: FRED_API_KEY missing.")
-        return
 
+def load_category_tree(path=TREE_FILE, ttl_days=TREE_TTL_DAYS):
+    """
+    Đọc cây category đã lưu. Trả về {category_id: [child_id, ...]}, hoặc None nếu chưa có/quá cũ.
+    """
     try:
-        fred = Fred(api_key=api_key)
-    except Exception as e:
-        print(f"Error init: {e}")
-        return
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = json.load(f)
+        scanned_at = datetime.strptime(tree["scanned_at"], "%Y-%m-%d %H:%M:%S")
+    except (OSError, ValueError, KeyError):
+        return None
 
-    print(f"--- STARTING FULL SCAN FOR CATEGORY {ROOT_CATEGORY_ID} (VIETNAM) ---")
-    print("This may take a while depending on the number of sub-categories...")
+    if datetime.now() - scanned_at > timedelta(days=ttl_days):
+        return None
+    return {int(category_id): entry["children"] for category_id, entry in tree["categories"].items()}
 
-    # 1. Get All Series Metadata
-    all_series_metadata = get_all_series_ids(fred, ROOT_CATEGORY_ID)
-    total_series = len(all_series_metadata)
-    print(f"\n✅ Found {total_series} unique series. Starting data fetch...")
 
-    final_data = {
-        "source": "FRED (Category 32841 - Vietnam)",
-        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "total_indicators": total_series,
-        "indicators": []
-    }
+def save_category_tree(categories, root_id, path=TREE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "root_category_id": root_id,
+            "scanned_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "categories": {
+                str(category_id): {"children": entry["children"], "series_ids": list(entry["series"])}
+                for category_id, entry in categories.items()
+            }
+        }, f, indent=2)
 
-    # 2. Fetch Latest Data for each Series
-    count = 0
-    for s_id, meta in all_series_metadata.items():
-        count += 1
-        print(f"[{count}/{total_series}] Fetching: {s_id}...", end='\r')
-        
+
+async def get_all_series_ids(fred, category_id, rescan=False):
+    """
+    Tìm tất cả Series ID trong category cha và các category con.
+    """
+    known_children = None if rescan else load_category_tree(TREE_FILE)
+    if known_children:
+        print(f"🌳 Using saved category tree ({len(known_children)} categories) from {TREE_FILE}")
+
+    categories = await scan_categories(fred, category_id, known_children)
+
+    save_category_tree(categories, category_id, TREE_FILE)
+    return collect_series(categories, category_id)
+
+async def fetch_latest_values(fred, all_series_metadata, journal=None):
+    """
+    Lấy giá trị mới nhất của tất cả series song song (số kết nối và tốc độ do AsyncFredClient giới hạn).
+    Kết quả giữ đúng thứ tự tìm thấy series. Mỗi series tải thành công được ghi vào journal (nếu có).
+    """
+    total_series = len(all_series_metadata)
+    done = 0
+
+    async def fetch(s_id, meta):
+        nonlocal done
         try:
-            # Lấy dữ liệu. sort_order='desc' & limit=1 để lấy cái mới nhất
-            # fredapi cho phép truyền kwargs vào underlying request
-            # API param: sort_order='desc', limit=1
-            series_data = fred.get_series(s_id, sort_order='desc', limit=1)
-            
-            latest_val = None
-            latest_date = None
-
-            if not series_data.empty:
-                latest_date = series_data.index[0].strftime('%Y-%m-%d')
-                val = series_data.iloc[0]
-                latest_val = float(val) if pd.notna(val) else None
-
-            # Add to result
+            latest_date, latest_val = await fred.latest_observation(s_id)
             item = {
                 "id": s_id,
+                "last_updated": meta.get('last_updated'),
                 "metadata": {
                     "title": meta['title'],
                     "units": meta['units'],
@@ -117,26 +194,247 @@ def main():
                     "value": latest_val
                 }
             }
-            final_data["indicators"].append(item)
-            
-            # Nhẹ nhàng với API (Rate limit)
-            time.sleep(0.1) 
-
         except Exception as e:
             # Vẫn lưu metadata nhưng data null
-            final_data["indicators"].append({
+            item = {
                 "id": s_id,
                 "metadata": meta,
                 "error": str(e),
                 "latest_data": None
-            })
+            }
+
+        if journal is not None and "error" not in item:
+            journal.append({"type": "indicator", "item": item})
+        done += 1
+        print(f"[{done}/{total_series}] Fetched: {s_id}...", end='\r')
+        return item
+
+    return await asyncio.gather(*(fetch(s_id, meta) for s_id, meta in all_series_metadata.items()))
+
+
+def frequency_partition(frequency):
+    """
+    Tên thư mục phân vùng theo tần suất FRED: "Weekly, Ending Friday" -> "weekly".
+    """
+    name = (frequency or "unknown").split(',')[0].strip().lower()
+    return name.replace(' ', '_') or "unknown"
+
+
+def history_path(history_dir, s_id, meta):
+    return os.path.join(history_dir, f"frequency={frequency_partition(meta.get('frequency'))}", f"{s_id}.parquet")
+
+
+def stored_last_updated(path):
+    """
+    last_updated của series lưu trong metadata file Parquet (chỉ đọc footer), hoặc None nếu chưa có file.
+    """
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    value = metadata.get(b'last_updated')
+    return value.decode() if value else None
+
+
+def write_history_file(path, s_id, meta, records):
+    """
+    Ghi lịch sử một series ra Parquet (series_id, date, value). Ghi ra file tạm (tên bắt đầu bằng "_",
+    pyarrow.dataset bỏ qua) rồi đổi tên, nên crash giữa chừng không làm hỏng dataset. File của series
+    ở phân vùng tần suất khác (tần suất đã đổi) bị xóa để series không xuất hiện hai lần.
+    """
+    table = pa.table({
+        "series_id": pa.array([s_id] * len(records), pa.string()).dictionary_encode(),
+        "date": pa.array([r["date"] for r in records], pa.string()).cast(pa.date32()),
+        "value": pa.array([r["value"] for r in records], pa.float64()),
+    }).replace_schema_metadata({
+        "title": meta.get('title') or "",
+        "units": meta.get('units') or "",
+        "frequency": meta.get('frequency') or "",
+        "seasonal_adjustment": meta.get('seasonal_adjustment') or "",
+        "last_updated": meta.get('last_updated') or "",
+    })
+    partition_dir = os.path.dirname(path)
+    history_dir = os.path.dirname(partition_dir)
+    os.makedirs(partition_dir, exist_ok=True)
+    tmp_path = os.path.join(partition_dir, f"_{s_id}.parquet.tmp")
+    pq.write_table(table, tmp_path)
+
+    for partition in os.listdir(history_dir):
+        stale_path = os.path.join(history_dir, partition, os.path.basename(path))
+        if partition.startswith("frequency=") and stale_path != path and os.path.exists(stale_path):
+            os.remove(stale_path)
+    os.replace(tmp_path, path)
+
+
+async def harvest_history(fred, all_series_metadata, history_dir=HISTORY_DIR, full=False, max_workers=MAX_WORKERS):
+    """
+    Tải toàn bộ observations của từng series bằng max_workers worker và ghi ngay ra file Parquet
+    của series đó, nên bộ nhớ chỉ giữ tối đa max_workers series cùng lúc dù cây category lớn đến đâu.
+
+    Series có file với cùng last_updated được bỏ qua (trừ khi full=True), nên chạy lại sau khi
+    bị gián đoạn chỉ tải các series còn thiếu. Trả về số series (written, skipped, failed).
+    """
+    queue = asyncio.Queue()
+    for s_id, meta in all_series_metadata.items():
+        queue.put_nowait((s_id, meta))
+    total_series = queue.qsize()
+    counts = {"written": 0, "skipped": 0, "failed": 0}
+
+    async def worker():
+        while not queue.empty():
+            s_id, meta = queue.get_nowait()
+            path = history_path(history_dir, s_id, meta)
+            last_updated = meta.get('last_updated')
+            if not full and last_updated and stored_last_updated(path) == last_updated:
+                counts["skipped"] += 1
+                continue
+            try:
+                records = await fred.observations(s_id)
+                await asyncio.to_thread(write_history_file, path, s_id, meta, records)
+                counts["written"] += 1
+            except Exception as e:
+                print(f"\n⚠️ Error fetching history of {s_id}: {e}")
+                counts["failed"] += 1
+            print(f"[{sum(counts.values())}/{total_series}] History: {s_id}...", end='\r')
+
+    await asyncio.gather(*(worker() for _ in range(max_workers)))
+    return counts["written"], counts["skipped"], counts["failed"]
+
+
+def load_previous_indicators(path=OUTPUT_FILE):
+    """
+    Các indicator đã tải thành công ở lần chạy trước, theo dạng {series_id: item}.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return {
+        item["id"]: item for item in previous.get("indicators", [])
+        if item.get("last_updated") and item.get("latest_data") is not None and "error" not in item
+    }
+
+
+def changed_series(all_series_metadata, previous):
+    """
+    Series cần tải lại: series mới hoặc có last_updated khác với lần chạy trước.
+    """
+    return {
+        s_id: meta for s_id, meta in all_series_metadata.items()
+        if s_id not in previous or previous[s_id]["last_updated"] != meta.get('last_updated')
+    }
+
+
+async def crawl(api_key, all_series_metadata, completed, journal, rescan=False, full=False, history=False):
+    """
+    Tìm series (nếu chưa có từ checkpoint) rồi tải giá trị mới nhất, dùng chung một AsyncFredClient.
+    Trả về (all_series_metadata, previous, fetched).
+
+    history=True: tải toàn bộ lịch sử vào HISTORY_DIR (harvest_history) thay cho giá trị mới nhất;
+    khi đó previous và fetched rỗng.
+    """
+    async with AsyncFredClient(api_key, max_connections=MAX_WORKERS) as fred:
+        # 1. Get All Series Metadata
+        if all_series_metadata is None:
+            all_series_metadata = await get_all_series_ids(fred, ROOT_CATEGORY_ID, rescan=rescan)
+            journal.append({"type": "discovered", "series": all_series_metadata})
+            journal.flush()
+
+            # Danh sách series theo category đã có đủ metadata: lưu vào cache dùng chung
+            # để các scraper khác (scraper_vietnam.py) không phải gọi lại series info
+            metadata_cache = SeriesMetadataCache()
+            metadata_cache.put_many(all_series_metadata)
+            metadata_cache.save()
+        else:
+            print(f"📋 Loaded {len(all_series_metadata)} discovered series from checkpoint")
+        total_series = len(all_series_metadata)
+        print(f"\n✅ Found {total_series} unique series. Starting data fetch...")
+
+        if history:
+            written, skipped, failed = await harvest_history(fred, all_series_metadata, HISTORY_DIR, full=full)
+            print(f"\n📦 History: {written} series written, {skipped} unchanged, {failed} failed -> {HISTORY_DIR}")
+            return all_series_metadata, {}, []
+
+        # 2. Fetch Latest Data, chỉ cho các series đã thay đổi kể từ lần chạy trước
+        # và chưa tải xong trong lượt chạy bị gián đoạn
+        previous = {} if full else load_previous_indicators(OUTPUT_FILE)
+        changed = changed_series(all_series_metadata, previous)
+        to_fetch = {s_id: meta for s_id, meta in changed.items() if s_id not in completed}
+        print(f"♻️  {total_series - len(changed)} series unchanged since last run, "
+              f"{len(changed) - len(to_fetch)} already fetched, fetching {len(to_fetch)}...")
+        fetched = await fetch_latest_values(fred, to_fetch, journal=journal)
+
+    return all_series_metadata, previous, fetched
+
+
+def main(rescan=False, full=False, resume=False, history=False):
+    load_dotenv()
+    api_key = os.getenv('FRED_API_KEY')
+    if not api_key:
+        print("Error: FRED_API_KEY missing.")
+        return
+    if history and pa is None:
+        print("Error: --history requires pyarrow (pip install pyarrow).")
+        return
+
+    print(f"--- STARTING FULL SCAN FOR CATEGORY {ROOT_CATEGORY_ID} (VIETNAM) ---")
+    print("This may take a while depending on the number of sub-categories...")
+
+    journal = CheckpointJournal(JOURNAL_FILE)
+    entries = journal.read() if resume else []
+    if entries:
+        print(f"⏯️  Resuming from checkpoint {JOURNAL_FILE}")
+    else:
+        journal.start()
+
+    all_series_metadata = next((entry["series"] for entry in entries if entry["type"] == "discovered"), None)
+    completed = {entry["item"]["id"]: entry["item"] for entry in entries if entry["type"] == "indicator"}
+
+    try:
+        all_series_metadata, previous, fetched = asyncio.run(
+            crawl(api_key, all_series_metadata, completed, journal, rescan=rescan, full=full, history=history)
+        )
+    finally:
+        # Ghi nốt lô cuối kể cả khi bị Ctrl-C / lỗi, để --resume không phải tải lại
+        journal.flush()
+
+    if history:
+        # Lịch sử đã nằm trong các file Parquet, không ghi đè file giá trị mới nhất
+        journal.remove()
+        return
+
+    fetched = {**completed, **{item["id"]: item for item in fetched}}
+    indicators = [fetched[s_id] if s_id in fetched else previous[s_id] for s_id in all_series_metadata]
+
+    final_data = {
+        "source": "FRED (Category 32841 - Vietnam)",
+        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_indicators": len(all_series_metadata),
+        "indicators": indicators
+    }
 
     # 3. Save
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         json.dump(final_data, f, indent=2, ensure_ascii=False)
 
+    journal.remove()
+
     print(f"\n\n🎉 Completed! Saved {len(final_data['indicators'])} indicators to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rescan', action='store_true',
+                        help="Quét lại cây category từ đầu, bỏ qua cây đã lưu")
+    parser.add_argument('--full', action='store_true',
+                        help="Tải lại tất cả series, kể cả series không thay đổi")
+    parser.add_argument('--resume', action='store_true',
+                        help="Tiếp tục từ checkpoint của lượt chạy bị gián đoạn")
+    parser.add_argument('--history', action='store_true',
+                        help=f"Tải toàn bộ lịch sử từng series vào Parquet ({HISTORY_DIR}, phân vùng theo tần suất)")
+    args = parser.parse_args()
+
+    main(rescan=args.rescan, full=args.full, resume=args.resume, history=args.history)
@@ -1,14 +1,20 @@
 import os
+import sys
 import json
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.imf import BASE_URL, ImfCache, fetch_imf_indicators
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
-BASE_URL = "https://www.imf.org/external/datamapper/api/v1"
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 OUTPUT_FILE = os.path.join(DATA_DIR, "global_inflation.json")
 
@@ -23,34 +29,32 @@ ENTITIES = {
     "OEMDC": "Emerging market and developing economies"
 }
 
+# Chỉ lấy dữ liệu từ năm 2020 đến hết kỳ dự báo của WEO (5 năm sau năm hiện tại)
+START_YEAR = 2020
+END_YEAR = datetime.now().year + 5
+
 
 def get_inflation_data():
     """
-    Lấy dữ liệu lạm phát toàn cầu từ IMF WEO API.
+    Lấy dữ liệu lạm phát toàn cầu từ IMF WEO API (qua scrapers/common/imf.py, có cache dùng chung).
+    Chỉ tải các thực thể trong ENTITIES và các năm START_YEAR..END_YEAR.
+    Trả về ({entity_code: {year: value}} hoặc None nếu lỗi, vintage WEO của dữ liệu).
     """
-    url = f"{BASE_URL}/{INDICATOR_CODE}"
     print(f"📥 Đang tải dữ liệu lạm phát từ IMF WEO API...")
-    
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Lỗi khi tải dữ liệu: {e}")
-        return None
+    cache = ImfCache()
+    data = fetch_imf_indicators([INDICATOR_CODE], ENTITIES, START_YEAR, END_YEAR, cache=cache)
+    return data.get(INDICATOR_CODE), cache.vintage
 
 
-def extract_entity_data(api_data):
+def extract_entity_data(indicator_data):
     """
     Trích xuất dữ liệu cho các thực thể toàn cầu (World, Advanced, Emerging).
     """
     results = []
     
-    if not api_data or "values" not in api_data:
+    if not indicator_data:
         return results
     
-    indicator_data = api_data["values"].get(INDICATOR_CODE, {})
-    
     for entity_code, entity_name in ENTITIES.items():
         entity_data = indicator_data.get(entity_code, {})
         
@@ -59,7 +63,7 @@ def extract_entity_data(api_data):
                 # Chỉ lấy dữ liệu từ năm 2020 trở đi
                 try:
                     year_int = int(year)
-                    if year_int >= 2020 and value is not None:
+                    if year_int >= START_YEAR and value is not None:
                         results.append({
                             "entity": entity_name,
                             "entity_code": entity_code,
@@ -79,7 +83,7 @@ def main():
     print("--- Global Inflation Trends Scraper (IMF WEO API) ---\n")
     
     # Lấy dữ liệu từ API
-    api_data = get_inflation_data()
+    api_data, weo_vintage = get_inflation_data()
     
     if not api_data:
         print("❌ Không thể lấy dữ liệu từ API")
@@ -99,7 +103,8 @@ def main():
     
     # Chuẩn bị output
     output_structure = {
-        "source": "IMF World Economic Outlook API (October 2025)",
+        "source": f"IMF World Economic Outlook API ({weo_vintage})" if weo_vintage else "IMF World Economic Outlook API",
+        "weo_vintage": weo_vintage,
         "base_url": BASE_URL,
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "description": "Global inflation trends for World, Advanced economies, and Emerging markets from 2020 onwards (including 2025 forecasts)",
@@ -1,14 +1,20 @@
 import os
+import sys
 import json
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.imf import BASE_URL, ImfCache, fetch_imf_indicators
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
-BASE_URL = "https://www.imf.org/external/datamapper/api/v1"
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 OUTPUT_FILE = os.path.join(DATA_DIR, "imf_data.json")
 
@@ -25,35 +31,31 @@ COUNTRIES = {
     "EURO": "Euro Area"  # Euro Area code trong IMF là EURO
 }
 
+# Chỉ lấy dữ liệu từ năm 2020 đến hết kỳ dự báo của WEO (5 năm sau năm hiện tại)
+START_YEAR = 2020
+END_YEAR = datetime.now().year + 5
 
 
-def get_indicator_data(indicator_code):
+def get_indicators_data():
     """
-    Lấy dữ liệu cho một indicator cụ thể từ IMF API.
+    Lấy dữ liệu của tất cả INDICATORS từ IMF API (song song, có cache dùng chung trong scrapers/common/imf.py).
+    Chỉ tải các quốc gia trong COUNTRIES và các năm START_YEAR..END_YEAR.
+    Trả về ({indicator_code: {country_code: {year: value}}}, vintage WEO của dữ liệu).
     """
-    url = f"{BASE_URL}/{indicator_code}"
-    print(f"📥 Đang tải dữ liệu cho {INDICATORS.get(indicator_code, indicator_code)}...")
-    
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Lỗi khi tải {indicator_code}: {e}")
-        return None
+    cache = ImfCache()
+    data = fetch_imf_indicators(INDICATORS, COUNTRIES, START_YEAR, END_YEAR, cache=cache)
+    return data, cache.vintage
 
 
-def extract_country_data(api_data, indicator_code, indicator_name):
+def extract_country_data(indicator_data, indicator_code, indicator_name):
     """
     Trích xuất dữ liệu cho các quốc gia cần thiết.
     """
     results = []
     
-    if not api_data or "values" not in api_data:
+    if not indicator_data:
         return results
     
-    indicator_data = api_data["values"].get(indicator_code, {})
-    
     for country_code, country_name in COUNTRIES.items():
         country_data = indicator_data.get(country_code, {})
         
@@ -62,7 +64,7 @@ def extract_country_data(api_data, indicator_code, indicator_name):
                 # Chỉ lấy dữ liệu từ năm 2020 trở đi
                 try:
                     year_int = int(year)
-                    if year_int >= 2020 and value is not None:
+                    if year_int >= START_YEAR and value is not None:
                         results.append({
                             "country": country_name,
                             "country_code": country_code,
@@ -82,12 +84,11 @@ def main():
     
     all_data = []
     
-    # Lấy dữ liệu cho từng indicator
+    # Lấy dữ liệu của tất cả indicator trong một lượt
+    api_data, weo_vintage = get_indicators_data()
     for ind_code, ind_name in INDICATORS.items():
-        api_data = get_indicator_data(ind_code)
-        
-        if api_data:
-            country_data = extract_country_data(api_data, ind_code, ind_name)
+        if api_data.get(ind_code):
+            country_data = extract_country_data(api_data[ind_code], ind_code, ind_name)
             all_data.extend(country_data)
             print(f"   ✅ Đã lấy {len(country_data)} bản ghi")
         else:
@@ -98,7 +99,8 @@ def main():
     
     # Chuẩn bị output
     output_structure = {
-        "source": "IMF World Economic Outlook API",
+        "source": f"IMF World Economic Outlook API ({weo_vintage})" if weo_vintage else "IMF World Economic Outlook API",
+        "weo_vintage": weo_vintage,
         "base_url": BASE_URL,
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "description": "GDP data for China, United States, and Euro Area from 2020 onwards",
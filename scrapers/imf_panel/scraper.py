@@ -0,0 +1,76 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Cho phép import các module dùng chung trong scrapers/common khi chạy trực tiếp script này
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+
+from scrapers.common.imf import ImfCache, fetch_imf_indicators
+from scrapers.common.imf_panel import build_panel, save_panel
+
+# Configuration
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+OUTPUT_FILE = os.path.join(DATA_DIR, "imf_panel.parquet")
+
+# Các indicator WEO mặc định (IMF DataMapper)
+INDICATORS = {
+    "NGDP_RPCH": "Real GDP growth (Annual percent change)",
+    "NGDPD": "GDP, current prices (Billions of U.S. dollars)",
+    "NGDPDPC": "GDP per capita, current prices (U.S. dollars per capita)",
+    "PPPGDP": "GDP, current prices (Purchasing power parity; billions of international dollars)",
+    "PPPPC": "GDP per capita, current prices (Purchasing power parity; international dollars per capita)",
+    "PPPSH": "GDP based on PPP, share of world (Percent of World)",
+    "PCPIPCH": "Inflation rate, average consumer prices (Annual percent change)",
+    "PCPIEPCH": "Inflation rate, end of period consumer prices (Annual percent change)",
+    "LUR": "Unemployment rate (Percent)",
+    "LP": "Population (Millions of people)",
+    "BCA": "Current account balance, U.S. dollars (Billions of U.S. dollars)",
+    "BCA_NGDPD": "Current account balance (Percent of GDP)",
+    "GGXCNL_NGDP": "General government net lending/borrowing (Percent of GDP)",
+    "GGXWDG_NGDP": "General government gross debt (Percent of GDP)",
+    "GGR_NGDP": "General government revenue (Percent of GDP)",
+    "GGX_NGDP": "General government total expenditure (Percent of GDP)",
+    "NID_NGDP": "Total investment (Percent of GDP)",
+    "NGSD_NGDP": "Gross national savings (Percent of GDP)",
+    "TX_RPCH": "Volume of exports of goods and services (Annual percent change)",
+    "TM_RPCH": "Volume of imports of goods and services (Annual percent change)",
+}
+
+START_YEAR = 1980
+END_YEAR = datetime.now().year + 5
+
+
+def main(indicators=None, start_year=START_YEAR, end_year=END_YEAR):
+    print("--- IMF Panel Builder (all economies × years) ---\n")
+    indicators = indicators or list(INDICATORS)
+
+    # Mọi thực thể IMF, tất cả indicator tải song song (có cache theo vintage WEO)
+    data = fetch_imf_indicators(indicators, None, start_year, end_year, cache=ImfCache())
+    if not data:
+        print("❌ Không thể lấy dữ liệu từ API")
+        return
+
+    panel = build_panel(data, start_year=start_year, end_year=end_year)
+    print(f"\n✅ Panel: {len(panel.entities)} thực thể × {len(panel.years)} năm × {len(panel.values)} indicator")
+    for indicator, array in panel.values.items():
+        print(f"   {indicator}: {int(np.count_nonzero(~np.isnan(array)))} giá trị")
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    save_panel(panel, OUTPUT_FILE)
+    print(f"\n💾 Đã lưu panel vào {OUTPUT_FILE}")
+    print("\n🏁 Hoàn thành!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--indicators', nargs='+', help="Mã indicator IMF (mặc định: INDICATORS)")
+    parser.add_argument('--start-year', type=int, default=START_YEAR)
+    parser.add_argument('--end-year', type=int, default=END_YEAR)
+    args = parser.parse_args()
+
+    main(args.indicators, args.start_year, args.end_year)
@@ -7,15 +7,24 @@ Scraper for US Macro Economic Indicators
 - DXY Dollar Index (from Yahoo Finance)
 """
 
+import os
+import sys
 import yfinance as yf
 import pandas as pd
-from pandas_datareader import data as pdr
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+# Allow importing shared modules from scrapers/common when running this script directly
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from scrapers.common.fred_csv import FredCsvCache, fetch_fred_csv_batch
+from scrapers.common.fred_registry import series_for, unique_series
+
 # Configuration
-OUTPUT_FILE = "data/us_macro_data.json"
+OUTPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "us_macro_data.json")
 START_DATE = "2020-01-01"  # 5年分のdata
 END_DATE = datetime.now().strftime("%Y-%m-%d")
 
@@ -24,11 +33,19 @@ YAHOO_SYMBOLS = {
     # DXY removed due to Yahoo Finance API issues - using FRED instead
 }
 
-FRED_SERIES = {
-    "fed_funds_rate": "FEDFUNDS",  # Federal Funds Effective Rate
-    "us_10y_yield": "DGS10",       # 10-Year Treasury Constant Maturity Rate
-    "dxy": "DTWEXBGS"              # Trade Weighted U.S. Dollar Index: Broad, Goods and Services
-}
+# FRED series are declared in scrapers/common/fred_registry.py (output "us_macro"):
+# fed_funds_rate = FEDFUNDS, us_10y_yield(_yoy) = DGS10, dxy(_yoy) = DTWEXBGS.
+# DGS10 and DTWEXBGS are daily; FRED aggregates them to monthly averages (and YoY changes) server-side.
+US_MACRO_SERIES = series_for("us_macro")
+FRED_SERIES = {info["key"]: key for key, info in US_MACRO_SERIES.items()}
+
+
+def fred_spec(key: str):
+    """
+    Series spec for fetch_fred_csv_batch: the series ID, or (series ID, transform).
+    """
+    info = US_MACRO_SERIES[key]
+    return (info["series_id"], info["transform"]) if info.get("transform") else info["series_id"]
 
 
 def fetch_yahoo_data(symbol: str, name: str) -> List[Dict[str, Any]]:
@@ -63,29 +80,43 @@ def fetch_yahoo_data(symbol: str, name: str) -> List[Dict[str, Any]]:
         return []
 
 
-def fetch_fred_data(series_id: str, name: str) -> List[Dict[str, Any]]:
+def fred_frame_to_records(df: pd.DataFrame, name: str) -> List[Dict[str, Any]]:
     """
-    Fetch data from FRED using pandas_datareader.
+    Convert a FRED (date, value) frame into output records.
     """
-    print(f"\n📊 Fetching: {name} ({series_id})")
+    values = pd.to_numeric(df['value'], errors='coerce')
+    dates = pd.to_datetime(df['date'])
+    mask = values.notna()
+    
+    return [
+        {
+            'indicator': name,
+            'date': date,
+            'value': round(value, 4),
+            'source': 'FRED'
+        }
+        for date, value in zip(dates[mask].dt.strftime("%Y-%m-%d"), values[mask].astype(float))
+    ]
+
+
+def fetch_fred_data(key: str, name: str, frames: Dict[str, pd.DataFrame] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch data from FRED (fredgraph.csv).
+    key: registry key (series ID, plus the transform if any).
+    frames: data already downloaded by fred_engine / scrape_all_data; FRED is not called again.
+    """
+    print(f"\n📊 Fetching: {name} ({key})")
     
     try:
-        df = pdr.DataReader(series_id, 'fred', START_DATE, END_DATE)
+        if frames is None:
+            frames = fetch_fred_csv_batch([fred_spec(key)], start_date=START_DATE, cache=FredCsvCache())
         
-        if df.empty:
-            print(f"   ⚠️  No data available for {series_id}")
+        df = frames.get(key)
+        if df is None or df.empty:
+            print(f"   ⚠️  No data available for {key}")
             return []
         
-        # Convert to records
-        records = []
-        for date, value in df[series_id].items():
-            if pd.notna(value):
-                records.append({
-                    'indicator': name,
-                    'date': date.strftime("%Y-%m-%d"),
-                    'value': round(float(value), 4),
-                    'source': 'FRED'
-                })
+        records = fred_frame_to_records(df[df['date'] >= START_DATE], name)
         
         print(f"   ✓ Extracted {len(records)} records")
         return records
@@ -95,7 +126,7 @@ def fetch_fred_data(series_id: str, name: str) -> List[Dict[str, Any]]:
         return []
 
 
-def scrape_all_data() -> Dict[str, Any]:
+def scrape_all_data(frames: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Main scraping function.
     """
@@ -114,8 +145,13 @@ def scrape_all_data() -> Dict[str, Any]:
     
     # Fetch FRED data
     print("\n📡 Fetching from FRED...")
-    for key, series_id in FRED_SERIES.items():
-        records = fetch_fred_data(series_id, key)
+    if frames is None:
+        # All FRED series in as few requests as possible (one per transform).
+        # No end_date: FRED returns up to the latest observation and the URL stays the same across days,
+        # so the cached ETag/Last-Modified can be reused.
+        frames = fetch_fred_csv_batch(unique_series(["us_macro"]), start_date=START_DATE, cache=FredCsvCache())
+    for name, key in FRED_SERIES.items():
+        records = fetch_fred_data(key, name, frames)
         all_data.extend(records)
     
     # Create summary
@@ -134,13 +170,13 @@ def scrape_all_data() -> Dict[str, Any]:
     return result
 
 
-def main():
+def main(frames: Dict[str, pd.DataFrame] = None):
     """
     Main execution function.
     """
     try:
         # Scrape data
-        result = scrape_all_data()
+        result = scrape_all_data(frames)
         
         # Save to JSON
         print(f"\n💾 Saving data to {OUTPUT_FILE}...")